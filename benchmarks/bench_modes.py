@@ -0,0 +1,253 @@
+"""Замеры всех режимов парсера на синтетическом офлайн-корпусе.
+
+Страницы индекса PEP, карточек PEP, статей whats-new, главной страницы
+документации и страницы загрузок генерируются заранее и отдаются через
+mock-адаптер, поэтому замеры не зависят от сети.
+
+Запуск из корня проекта:
+
+    python benchmarks/bench_modes.py --sizes 10 100 1000
+"""
+import argparse
+import datetime as dt
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from unittest import mock
+
+import requests_mock
+from requests_cache import CachedSession
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+SRC_DIR = BENCHMARKS_DIR.parent / 'src'
+sys.path.append(str(SRC_DIR))
+
+RESULTS_DIR = BENCHMARKS_DIR / 'results'
+DEFAULT_SIZES = (10, 100, 1000)
+PEP_STATUSES = (('SF', 'Final'), ('PA', 'Active'), ('SR', 'Rejected'))
+ARCHIVE_CHUNK = bytes(range(256)) * 4
+
+PEP_INDEX_ROW = (
+    '<tr class="row-{parity}"><td><abbr>{table_status}</abbr></td>'
+    '<td><a class="pep reference internal" href="pep-{number:04d}/">'
+    '{number}</a></td><td><a href="pep-{number:04d}/">Title {number}</a>'
+    '</td><td>Author {number}</td></tr>'
+)
+PEP_CARD = (
+    '<html><body><article><h1>PEP {number}</h1>'
+    '<dl class="rfc2822 field-list simple">'
+    '<dt class="field-odd">Author<span class="colon">:</span></dt>'
+    '<dd class="field-odd">Author {number}</dd>'
+    '<dt class="field-even">Status<span class="colon">:</span></dt>'
+    '<dd class="field-even"><abbr>{card_status}</abbr></dd>'
+    '<dt class="field-odd">Type<span class="colon">:</span></dt>'
+    '<dd class="field-odd">Standards Track</dd>'
+    '<dt class="field-even">Created<span class="colon">:</span></dt>'
+    '<dd class="field-even">01-Jan-2001</dd></dl>'
+    '{body}</article></body></html>'
+)
+PAGE_SECTION = (
+    '<section id="section-{number}"><h2>Section {number}</h2>'
+    '<p>Lorem ipsum <a href="#ref-{number}">dolor</a> sit amet, '
+    '<code>consectetur</code> adipiscing elit, sed do eiusmod tempor '
+    'incididunt ut labore et dolore magna aliqua.</p>'
+    '<ul><li>first</li><li>second</li></ul></section>'
+)
+WHATS_NEW_LINK = (
+    '<li class="toctree-l1"><a class="reference internal" '
+    'href="3.{number}.html">What’s New In Python 3.{number}</a></li>'
+)
+WHATS_NEW_PAGE = (
+    '<html><body><section><h1>What’s New In Python 3.{number}</h1>'
+    '<dl class="field-list simple"><dt>Editor:</dt>'
+    '<dd>Editor {number}</dd></dl>{body}</section></body></html>'
+)
+VERSION_LINK = (
+    '<li><a href="https://docs.python.org/3.{number}/">'
+    'Python 3.{number} (stable)</a></li>'
+)
+
+
+def make_body(sections):
+    return ''.join(
+        PAGE_SECTION.format(number=number) for number in range(sections)
+    )
+
+
+def make_corpus(size, sections):
+    from constants import (
+        DOWNLOADS_URL,
+        MAIN_DOC_URL,
+        PEP_TABLE_URL,
+        WHATS_NEW_URL,
+    )
+
+    body = make_body(sections)
+    corpus = {}
+    rows = []
+    for number in range(size):
+        table_status, card_status = PEP_STATUSES[number % len(PEP_STATUSES)]
+        rows.append(
+            PEP_INDEX_ROW.format(
+                parity='odd' if number % 2 else 'even',
+                table_status=table_status,
+                number=number,
+            )
+        )
+        corpus[f'{PEP_TABLE_URL}pep-{number:04d}/'] = PEP_CARD.format(
+            number=number, card_status=card_status, body=body
+        )
+    corpus[PEP_TABLE_URL] = (
+        '<html><body><section id="numerical-index"><table><tbody>'
+        f'{"".join(rows)}</tbody></table></section></body></html>'
+    )
+    links = []
+    for number in range(size):
+        links.append(WHATS_NEW_LINK.format(number=number))
+        corpus[f'{WHATS_NEW_URL}3.{number}.html'] = WHATS_NEW_PAGE.format(
+            number=number, body=body
+        )
+    corpus[WHATS_NEW_URL] = (
+        '<html><body><section id="what-s-new-in-python">'
+        '<div class="toctree-wrapper"><ul>'
+        f'{"".join(links)}</ul></div></section></body></html>'
+    )
+    versions = ''.join(
+        VERSION_LINK.format(number=number) for number in range(size)
+    )
+    corpus[MAIN_DOC_URL] = (
+        '<html><body><div class="sphinxsidebarwrapper"><ul>'
+        f'{versions}<li><a href="https://www.python.org/doc/versions/">'
+        'All versions</a></li></ul></div></body></html>'
+    )
+    corpus[DOWNLOADS_URL] = (
+        '<html><body><table class="docutils"><tr><td>PDF</td>'
+        '<td><a href="archives/python-docs-pdf-a4.zip">Download</a></td>'
+        f'</tr></table>{body}</body></html>'
+    )
+    corpus[f'{MAIN_DOC_URL}archives/python-docs-pdf-a4.zip'] = (
+        ARCHIVE_CHUNK * size
+    )
+    return corpus
+
+
+def make_adapter(corpus):
+    adapter = requests_mock.Adapter()
+    for url, content in corpus.items():
+        if isinstance(content, bytes):
+            adapter.register_uri('GET', url, content=content)
+        else:
+            adapter.register_uri('GET', url, text=content)
+    return adapter
+
+
+class ParseTimer:
+    """Обёртка над `make_soup`, суммирующая время разбора страниц."""
+
+    def __init__(self, make_soup):
+        self.make_soup = make_soup
+        self.elapsed = 0
+        self.pages = 0
+
+    def __call__(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self.make_soup(*args, **kwargs)
+        finally:
+            self.elapsed += time.perf_counter() - started
+            self.pages += 1
+
+
+def measure(mode, corpus, workers, base_dir):
+    import main
+    import parsers
+
+    adapter = make_adapter(corpus)
+    session = CachedSession(backend='memory')
+    for prefix in ('http://', 'https://'):
+        session.mount(prefix, adapter)
+    function = main.MODE_TO_FUNCTION[mode]
+    options = {'workers': workers} if mode in ('pep', 'whats-new') else {}
+    timer = ParseTimer(parsers.make_soup)
+    with mock.patch.object(parsers, 'make_soup', timer), mock.patch.object(
+        main, 'BASE_DIR', base_dir
+    ):
+        tracemalloc.start()
+        started = time.perf_counter()
+        results = function(session, **options)
+        if results is not None:
+            for _ in results:
+                pass
+        wall_time = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {
+        'mode': mode,
+        'pages': adapter.call_count,
+        'wall_time': wall_time,
+        'pages_per_sec': adapter.call_count / wall_time,
+        'parse_time_per_page': timer.elapsed / max(timer.pages, 1),
+        'peak_memory': peak,
+    }
+
+
+def main():
+    from constants import DATETIME_FORMAT
+    from main import MODE_TO_FUNCTION
+
+    # Для mirror в корпусе нет страниц загрузок отдельных версий.
+    bench_modes = [mode for mode in MODE_TO_FUNCTION if mode != 'mirror']
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=DEFAULT_SIZES
+    )
+    parser.add_argument('--sections', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument(
+        '--modes', nargs='+', choices=bench_modes, default=None
+    )
+    parser.add_argument('--output', type=Path, default=None)
+    args = parser.parse_args()
+    modes = args.modes or bench_modes
+    started_at = dt.datetime.now()
+    runs = []
+    with tempfile.TemporaryDirectory() as base_dir:
+        for size in args.sizes:
+            corpus = make_corpus(size, args.sections)
+            for mode in modes:
+                run = measure(mode, corpus, args.workers, Path(base_dir))
+                run['size'] = size
+                runs.append(run)
+                print(
+                    f'{mode:>15} N={size:<6} {run["wall_time"]:8.3f} с, '
+                    f'{run["pages_per_sec"]:8.1f} стр/с, '
+                    f'разбор {run["parse_time_per_page"] * 1000:.2f} мс/стр, '
+                    f'пик памяти {run["peak_memory"] / 1024:.0f} КиБ',
+                    file=sys.stderr,
+                )
+    output = args.output or RESULTS_DIR / (
+        f'modes_{started_at.strftime(DATETIME_FORMAT)}.json'
+    )
+    output.parent.mkdir(exist_ok=True)
+    with open(output, 'w', encoding='UTF-8') as file:
+        json.dump(
+            {
+                'started_at': started_at.isoformat(),
+                'python': sys.version,
+                'workers': args.workers,
+                'sections': args.sections,
+                'runs': runs,
+            },
+            file,
+            ensure_ascii=False,
+            indent=2,
+        )
+    print(f'Результаты сохранены: {output}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
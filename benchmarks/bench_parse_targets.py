@@ -0,0 +1,86 @@
+"""Сравнение полного разбора карточек PEP с разбором по цели.
+
+Запуск из корня проекта:
+
+    python benchmarks/bench_parse_targets.py --cards 200
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / 'src'
+sys.path.append(str(SRC_DIR))
+
+CARD_HEADER = (
+    '<dl class="rfc2822 field-list simple">'
+    '<dt class="field-odd">Author<span class="colon">:</span></dt>'
+    '<dd class="field-odd">Guido van Rossum</dd>'
+    '<dt class="field-even">Status<span class="colon">:</span></dt>'
+    '<dd class="field-even"><abbr title="Accepted">Final</abbr></dd>'
+    '<dt class="field-odd">Type<span class="colon">:</span></dt>'
+    '<dd class="field-odd">Standards Track</dd>'
+    '<dt class="field-even">Created<span class="colon">:</span></dt>'
+    '<dd class="field-even">01-Jan-2001</dd>'
+    '</dl>'
+)
+CARD_SECTION = (
+    '<section id="section-{number}"><h2>Section {number}</h2>'
+    '<p>Lorem ipsum <a href="#ref-{number}">dolor</a> sit amet, '
+    '<code>consectetur</code> adipiscing elit, sed do eiusmod tempor '
+    'incididunt ut labore et dolore magna aliqua.</p>'
+    '<div class="highlight"><pre><span class="k">def</span> '
+    '<span class="nf">spam</span>(<span class="n">eggs</span>):\n'
+    '    <span class="k">return</span> <span class="n">eggs</span>'
+    '</pre></div><ul><li>first</li><li>second</li></ul></section>'
+)
+
+
+def make_card(sections):
+    body = ''.join(
+        CARD_SECTION.format(number=number) for number in range(sections)
+    )
+    return (
+        '<html><head><title>PEP</title></head><body>'
+        f'<article><h1>PEP 8</h1>{CARD_HEADER}{body}</article>'
+        '</body></html>'
+    )
+
+
+def measure(cards, parse_only):
+    from extractors import extract_pep_card
+    from utils import make_soup
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    for card in cards:
+        extract_pep_card(make_soup(card, parse_only=parse_only))
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed / len(cards), peak
+
+
+def main():
+    from main import PEP_CARD_TARGET
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cards', type=int, default=200)
+    parser.add_argument('--sections', type=int, default=60)
+    args = parser.parse_args()
+    cards = [make_card(args.sections) for _ in range(args.cards)]
+    print(f'Карточек: {args.cards}, размер: {len(cards[0])} символов')
+    for name, parse_only in (
+        ('полный разбор', None),
+        ('разбор по цели', PEP_CARD_TARGET),
+    ):
+        per_card, peak = measure(cards, parse_only)
+        print(
+            f'{name:>15}: {per_card * 1000:.2f} мс на карточку, '
+            f'пик памяти {peak / 1024:.0f} КиБ'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Сравнение способов разбора HTML: BeautifulSoup и lxml с XPath.
+
+Запуск из корня проекта:
+
+    python benchmarks/bench_parsers.py --pages 200
+"""
+import argparse
+import time
+import tracemalloc
+
+from bench_modes import PEP_CARD, WHATS_NEW_PAGE, make_body
+
+
+def measure(extract, pages):
+    tracemalloc.start()
+    started = time.perf_counter()
+    rows = [extract(page) for page in pages]
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, elapsed / len(pages), peak
+
+
+def main():
+    from main import PEP_CARD_TARGET, WHATS_NEW_TARGET
+    from parsers import PARSERS
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--sections', type=int, default=60)
+    args = parser.parse_args()
+    body = make_body(args.sections)
+    pages = {
+        'карточка PEP': (
+            [
+                PEP_CARD.format(number=number, card_status='Final', body=body)
+                for number in range(args.pages)
+            ],
+            PEP_CARD_TARGET,
+            lambda html_parser, tree: html_parser.pep_card(tree),
+        ),
+        'статья whats-new': (
+            [
+                WHATS_NEW_PAGE.format(number=number, body=body)
+                for number in range(args.pages)
+            ],
+            WHATS_NEW_TARGET,
+            lambda html_parser, tree: html_parser.whats_new_article(tree),
+        ),
+    }
+    for kind, (documents, target, extract) in pages.items():
+        results = {}
+        for name, html_parser in PARSERS.items():
+            rows, per_page, peak = measure(
+                lambda page: extract(
+                    html_parser, html_parser.parse(page, target)
+                ),
+                documents,
+            )
+            results[name] = rows
+            print(
+                f'{kind:>16} {name:>5}: {per_page * 1000:.2f} мс на страницу, '
+                f'пик памяти {peak / 1024:.0f} КиБ'
+            )
+        if len({tuple(rows) for rows in results.values()}) != 1:
+            print(f'{kind:>16}: результаты разбора не совпадают')
+
+
+if __name__ == '__main__':
+    main()
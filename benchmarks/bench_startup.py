@@ -0,0 +1,116 @@
+"""Замер времени запуска парсера по `python -X importtime main.py -h`.
+
+Скрипт завершается с ошибкой, если при запуске импортируются тяжёлые
+зависимости или время импорта выросло относительно сохранённого замера.
+Замер хранится локально; пока его нет, время импорта сравнивается
+с общим бюджетом IMPORT_TIME_BUDGET.
+
+Запуск из корня проекта:
+
+    python benchmarks/bench_startup.py --save-baseline
+    python benchmarks/bench_startup.py
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+MAIN_PATH = BENCHMARKS_DIR.parent / 'src' / 'main.py'
+BASELINE_PATH = BENCHMARKS_DIR / 'startup_baseline.json'
+HEAVY_MODULES = (
+    'aiohttp',
+    'aiohttp_client_cache',
+    'bs4',
+    'lxml',
+    'prettytable',
+    'requests',
+    'requests_cache',
+    'tqdm',
+)
+IMPORT_TIME_PREFIX = 'import time:'
+IMPORT_TIME_BUDGET = 0.25
+
+
+def parse_import_times(stderr):
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith(IMPORT_TIME_PREFIX):
+            continue
+        _, cumulative, name = line[len(IMPORT_TIME_PREFIX):].split('|')
+        if not cumulative.strip().isdigit():
+            continue
+        modules[name.strip()] = (
+            int(cumulative),
+            len(name) - len(name.lstrip()) == 1,
+        )
+    return modules
+
+
+def measure():
+    started = time.perf_counter()
+    process = subprocess.run(
+        (sys.executable, '-X', 'importtime', str(MAIN_PATH), '-h'),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall_time = time.perf_counter() - started
+    modules = parse_import_times(process.stderr)
+    import_time = sum(
+        cumulative for cumulative, top_level in modules.values() if top_level
+    )
+    return wall_time, import_time / 10**6, set(modules)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    parser.add_argument('--save-baseline', action='store_true')
+    args = parser.parse_args()
+    runs = [measure() for _ in range(args.runs)]
+    wall_time = statistics.median(run[0] for run in runs)
+    import_time = statistics.median(run[1] for run in runs)
+    heavy = sorted(
+        module
+        for module in set.union(*(run[2] for run in runs))
+        if module.split('.')[0] in HEAVY_MODULES
+    )
+    print(
+        f'Запуск: {wall_time * 1000:.1f} мс, '
+        f'импорт: {import_time * 1000:.1f} мс'
+    )
+    failed = False
+    if heavy:
+        print(f'При запуске импортируются тяжёлые модули: {", ".join(heavy)}')
+        failed = True
+    if args.save_baseline:
+        BASELINE_PATH.write_text(
+            json.dumps({'import_time': import_time, 'wall_time': wall_time})
+        )
+        print(f'Замер сохранён: {BASELINE_PATH}')
+    else:
+        if BASELINE_PATH.exists():
+            baseline = json.loads(BASELINE_PATH.read_text())['import_time']
+            limit = baseline * (1 + args.tolerance)
+        else:
+            print(
+                f'Нет сохранённого замера {BASELINE_PATH.name}, '
+                f'используется бюджет {IMPORT_TIME_BUDGET * 1000:.0f} мс'
+            )
+            limit = IMPORT_TIME_BUDGET
+        if import_time > limit:
+            print(
+                f'Время импорта выросло: {import_time * 1000:.1f} мс, '
+                f'допустимо {limit * 1000:.1f} мс'
+            )
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+import asyncio
+import time
+from collections import deque
+from queue import Queue
+from threading import Thread
+
+from aiohttp import ClientError, ClientTimeout, TCPConnector, TraceConfig
+from aiohttp_client_cache import CacheBackend, CachedSession
+
+from caching import cache_stats, get_async_serializer, is_cacheable
+from constants import (
+    ASYNC_CACHE_SUFFIX,
+    CACHE_NAME,
+    CACHE_URLS_EXPIRE_AFTER,
+    DEFAULT_WORKERS,
+    FILESYSTEM_BACKEND,
+    IN_FLIGHT_PER_WORKER,
+    MEMORY_BACKEND,
+    SQLITE_BACKEND,
+)
+from fetch_policy import DEADLINE_ERROR, RETRY_STATUSES, fetch_policy
+from profiling import profiler
+from ratelimit import rate_limiter
+from utils import REQUEST_ERROR_FORMAT
+
+
+class AsyncCache:
+    """Настройки кеша асинхронного движка, взятые из аргументов запуска.
+
+    Хранилище создаётся заново для каждой загрузки, потому что соединение
+    с базой привязано к циклу событий; кеш в памяти переиспользуется.
+    """
+
+    def __init__(self):
+        self.configure(CACHE_NAME + ASYNC_CACHE_SUFFIX, SQLITE_BACKEND)
+
+    def configure(self, cache_name, backend, clear=False):
+        self.cache_name = cache_name
+        self.backend = backend
+        self.clear_pending = clear
+        self._memory_backend = None
+
+    def get_backend(self):
+        options = dict(
+            urls_expire_after=CACHE_URLS_EXPIRE_AFTER,
+            serializer=get_async_serializer(),
+            filter_fn=is_cacheable,
+        )
+        if self.backend == MEMORY_BACKEND:
+            if self._memory_backend is None:
+                self._memory_backend = CacheBackend(**options)
+            return self._memory_backend
+        if self.backend == FILESYSTEM_BACKEND:
+            from aiohttp_client_cache import FileBackend
+
+            return FileBackend(self.cache_name, **options)
+        from aiohttp_client_cache import SQLiteBackend
+
+        return SQLiteBackend(self.cache_name, **options)
+
+    async def clear_if_requested(self, session):
+        if self.clear_pending:
+            self.clear_pending = False
+            await session.cache.clear()
+
+
+async_cache = AsyncCache()
+
+
+# Запросы в сеть (но не ответы из кеша) проходят через те же ограничители
+# скорости по хостам, что и адаптер синхронной сессии.
+async def start_request(session, context, params):
+    context.limiter = rate_limiter.for_url(str(params.url))
+    await context.limiter.acquire_async()
+    context.started = time.perf_counter()
+
+
+async def end_request(session, context, params):
+    context.limiter.feedback(
+        params.response.status, time.perf_counter() - context.started
+    )
+
+
+async def fail_request(session, context, params):
+    context.limiter.feedback(None, time.perf_counter() - context.started)
+
+
+def get_rate_limit_trace():
+    trace = TraceConfig()
+    trace.on_request_start.append(start_request)
+    trace.on_request_end.append(end_request)
+    trace.on_request_exception.append(fail_request)
+    return trace
+
+
+async def get_text(
+    session, semaphore, url, encoding='UTF-8', refresh=False
+):
+    async with semaphore:
+        if refresh:
+            # Старая копия удаляется, чтобы новый ответ записался в кеш.
+            await session.cache.delete_url(url)
+        for attempt in range(fetch_policy.retries + 1):
+            if fetch_policy.expired():
+                fetch_policy.skip()
+                return ConnectionError(
+                    REQUEST_ERROR_FORMAT.format(url=url, error=DEADLINE_ERROR)
+                )
+            connect_timeout, read_timeout = fetch_policy.get_timeout()
+            try:
+                with profiler.phase(url, 'fetch'):
+                    # Ответ из кеша не поддерживает `async with` в новых
+                    # версиях aiohttp, поэтому соединение освобождается явно.
+                    response = await session.get(
+                        url,
+                        timeout=ClientTimeout(
+                            sock_connect=connect_timeout,
+                            sock_read=read_timeout,
+                        ),
+                    )
+                    try:
+                        status = response.status
+                        from_cache = getattr(response, 'from_cache', False)
+                        text = await response.text(encoding=encoding)
+                    finally:
+                        response.release()
+            except (ClientError, asyncio.TimeoutError) as error:
+                if attempt == fetch_policy.retries:
+                    return ConnectionError(
+                        REQUEST_ERROR_FORMAT.format(url=url, error=error)
+                    )
+            else:
+                if (
+                    status not in RETRY_STATUSES
+                    or attempt == fetch_policy.retries
+                ):
+                    break
+            await asyncio.sleep(fetch_policy.get_backoff(attempt))
+        cache_stats.record(from_cache)
+        if profiler.enabled:
+            profiler.record(
+                url, from_cache=from_cache, bytes=len(text.encode())
+            )
+        return text
+
+
+async def produce_texts(urls, limit, encoding, refresh, results):
+    semaphore = asyncio.Semaphore(limit)
+    pending = deque()
+    async with CachedSession(
+        cache=async_cache.get_backend(),
+        connector=TCPConnector(limit=limit),
+        trace_configs=[get_rate_limit_trace()],
+    ) as session:
+        await async_cache.clear_if_requested(session)
+        for url in urls:
+            if len(pending) >= limit * IN_FLIGHT_PER_WORKER:
+                text = await pending.popleft()
+                await asyncio.to_thread(results.put, (text, None))
+            pending.append(
+                asyncio.ensure_future(
+                    get_text(session, semaphore, url, encoding, refresh)
+                )
+            )
+        while pending:
+            text = await pending.popleft()
+            await asyncio.to_thread(results.put, (text, None))
+
+
+def run_producer(urls, limit, encoding, refresh, results):
+    try:
+        asyncio.run(
+            produce_texts(urls, limit, encoding, refresh, results)
+        )
+    except Exception as error:
+        results.put((None, error))
+
+
+def fetch_texts(
+    urls, limit=DEFAULT_WORKERS, encoding='UTF-8', refresh=False
+):
+    limit = max(limit, 1)
+    results = Queue(maxsize=limit)
+    Thread(
+        target=run_producer,
+        args=(urls, limit, encoding, refresh, results),
+        daemon=True,
+    ).start()
+    for _ in urls:
+        text, error = results.get()
+        if error is not None:
+            raise error
+        yield text
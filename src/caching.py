@@ -0,0 +1,325 @@
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import zlib
+from collections import OrderedDict
+from http import HTTPStatus
+from threading import Lock
+
+from constants import (
+    CACHE_CONTENT_TYPES,
+    CACHE_EVICTION_TARGET,
+    CACHE_MAX_RESPONSE_SIZE,
+    EXTRACT_CACHE_BATCH,
+    PART_SUFFIX,
+)
+
+
+class CacheStats:
+    """Счётчик попаданий в кеш за время работы парсера."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+
+    def record(self, from_cache):
+        with self._lock:
+            if from_cache:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    @property
+    def hit_ratio(self):
+        requests_count = self.hits + self.misses
+        return self.hits / requests_count if requests_count else 0
+
+
+cache_stats = CacheStats()
+
+
+CREATE_EXTRACTED = (
+    'CREATE TABLE IF NOT EXISTS extracted ('
+    'url TEXT NOT NULL, extractor TEXT NOT NULL, version INTEGER NOT NULL, '
+    'digest TEXT NOT NULL, value TEXT NOT NULL, '
+    'PRIMARY KEY (url, extractor))'
+)
+SELECT_EXTRACTED = (
+    'SELECT version, digest, value FROM extracted '
+    'WHERE url = ? AND extractor = ?'
+)
+UPSERT_EXTRACTED = (
+    'INSERT INTO extracted (url, extractor, version, digest, value) '
+    'VALUES (?, ?, ?, ?, ?) ON CONFLICT (url, extractor) DO UPDATE SET '
+    'version = excluded.version, digest = excluded.digest, '
+    'value = excluded.value'
+)
+DELETE_EXTRACTED = 'DELETE FROM extracted'
+EXTRACTOR_KEY_FORMAT = '{extractor}/{parser}'
+
+
+class ExtractCache:
+    """Данные, извлечённые со страниц, по хешу содержимого страницы.
+
+    Запись действительна, пока не изменились страница, способ разбора и
+    версия извлечения. Записи ищутся в базе по ключу, в памяти хранится
+    только очередь ещё не сохранённых записей.
+    """
+
+    def __init__(self):
+        self.path = None
+        self.versions = {}
+        self.pending = {}
+        self.hits = 0
+        self._connection = None
+        self._pid = None
+        self._lock = Lock()
+
+    def configure(self, path, versions, clear=False):
+        with self._lock:
+            if self.path is not None:
+                self._flush()
+            self.path = path
+            self.versions = versions
+            self.hits = 0
+            self._connection = None
+            if clear:
+                self._connect().execute(DELETE_EXTRACTED)
+                self._connection.commit()
+
+    def _connect(self):
+        if self._connection is None or self._pid != os.getpid():
+            self.path.parent.mkdir(exist_ok=True)
+            self._connection = sqlite3.connect(
+                self.path, check_same_thread=False
+            )
+            self._connection.execute(CREATE_EXTRACTED)
+            self.pending = {}
+            self._pid = os.getpid()
+        return self._connection
+
+    def _flush(self):
+        if not self.pending:
+            return
+        connection = self._connect()
+        connection.executemany(
+            UPSERT_EXTRACTED,
+            [(*key, *entry) for key, entry in self.pending.items()],
+        )
+        connection.commit()
+        self.pending = {}
+
+    def _get(self, key):
+        connection = self._connect()
+        entry = self.pending.get(key)
+        if entry is None:
+            entry = connection.execute(SELECT_EXTRACTED, key).fetchone()
+        return entry
+
+    def get_or_extract(self, url, extractor, parser, page, extract):
+        if self.path is None:
+            return extract(page)
+        key = (
+            url,
+            EXTRACTOR_KEY_FORMAT.format(extractor=extractor, parser=parser),
+        )
+        version = self.versions[extractor]
+        digest = hashlib.blake2b(page.encode()).hexdigest()
+        with self._lock:
+            entry = self._get(key)
+            if entry is not None and tuple(entry[:2]) == (version, digest):
+                self.hits += 1
+                return json.loads(entry[2])
+        value = extract(page)
+        encoded = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._connect()
+            self.pending[key] = (version, digest, encoded)
+            if len(self.pending) >= EXTRACT_CACHE_BATCH:
+                self._flush()
+        return value
+
+    def save(self):
+        with self._lock:
+            if self.path is not None:
+                self._flush()
+
+    def export(self):
+        with self._lock:
+            state = self.pending, self.hits
+            self.pending = {}
+            self.hits = 0
+        return state
+
+    def merge(self, pending, hits):
+        with self._lock:
+            self.hits += hits
+            if self.path is None or not pending:
+                return
+            self._connect()
+            self.pending.update(pending)
+            if len(self.pending) >= EXTRACT_CACHE_BATCH:
+                self._flush()
+
+
+extract_cache = ExtractCache()
+
+
+def get_compressed_serializer():
+    from requests_cache.serializers import (
+        SerializerPipeline,
+        Stage,
+        pickle_serializer,
+    )
+
+    return SerializerPipeline(
+        [
+            *pickle_serializer.stages,
+            Stage(zlib, dumps='compress', loads='decompress'),
+        ],
+        name='pickle_zlib',
+        is_binary=True,
+    )
+
+
+def get_async_serializer():
+    # Ответы aiohttp не преобразуются конвертерами requests-cache.
+    from requests_cache.serializers import SerializerPipeline, Stage
+
+    return SerializerPipeline(
+        [Stage(pickle), Stage(zlib, dumps='compress', loads='decompress')],
+        name='pickle_zlib_async',
+        is_binary=True,
+    )
+
+
+def is_cacheable(response):
+    content_type = response.headers.get(
+        'Content-Type', CACHE_CONTENT_TYPES[0]
+    )
+    size = int(response.headers.get('Content-Length', 0))
+    return (
+        content_type.startswith(CACHE_CONTENT_TYPES)
+        and size <= CACHE_MAX_RESPONSE_SIZE
+    )
+
+
+def get_stored_size(response):
+    return len(zlib.compress(response.content))
+
+
+class CacheLimit:
+    """Ограничение размера кеша с вытеснением давно не нужных ответов."""
+
+    def __init__(self):
+        self.cache = None
+        self.max_size = None
+        self.index_path = None
+        self.entries = OrderedDict()
+        self.size = 0
+        self.evicted = 0
+        self._lock = Lock()
+
+    def configure(self, cache, max_size, index_path=None):
+        self.cache = cache
+        self.max_size = max_size
+        self.index_path = index_path
+        self.evicted = 0
+        with self._lock:
+            self.entries = self._load_entries()
+            self.size = sum(self.entries.values())
+            self._evict()
+
+    def _load_entries(self):
+        index = {}
+        if self.index_path is not None and self.index_path.exists():
+            with open(self.index_path, encoding='UTF-8') as file:
+                index = json.load(file)
+        keys = set(self.cache.responses.keys())
+        entries = OrderedDict()
+        broken = []
+        for key in keys - index.keys():
+            response = self.cache.responses.get(key)
+            if response is None:
+                broken.append(key)
+            else:
+                entries[key] = get_stored_size(response)
+        entries.update(
+            (key, size) for key, size in index.items() if key in keys
+        )
+        if broken:
+            self.cache.delete(*broken)
+        return entries
+
+    def _evict(self):
+        target = self.max_size * CACHE_EVICTION_TARGET
+        keys = []
+        while self.entries and self.size > target:
+            key, size = self.entries.popitem(last=False)
+            self.size -= size
+            keys.append(key)
+        if keys:
+            self.cache.delete(*keys)
+            self.evicted += len(keys)
+
+    def touch(self, response):
+        key = getattr(response, 'cache_key', None)
+        if self.max_size is None or key is None:
+            return
+        from_cache = getattr(response, 'from_cache', False)
+        if not from_cache and not (
+            response.status_code == HTTPStatus.OK and is_cacheable(response)
+        ):
+            return
+        with self._lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                if from_cache:
+                    return
+                self.size -= self.entries[key]
+            self.entries[key] = get_stored_size(response)
+            self.size += self.entries[key]
+            if self.size > self.max_size:
+                self._evict()
+
+    def save(self):
+        if self.index_path is None:
+            return
+        with self._lock:
+            index = dict(self.entries)
+        temp_path = self.index_path.with_name(
+            self.index_path.name + PART_SUFFIX
+        )
+        with open(temp_path, 'w', encoding='UTF-8') as file:
+            json.dump(index, file)
+        os.replace(temp_path, self.index_path)
+
+
+cache_limit = CacheLimit()
+
+
+def get_cache_size(session):
+    if cache_limit.max_size is not None:
+        return cache_limit.size
+    responses = session.cache.responses
+    if hasattr(responses, 'size'):
+        return responses.size()
+    if hasattr(responses, 'paths'):
+        return sum(path.stat().st_size for path in responses.paths())
+    return sum(len(response.content) for response in responses.values())
+
+
+def get_cache_stats(session):
+    return [
+        ('Показатель', 'Значение'),
+        ('Записей в кеше', len(session.cache.responses)),
+        ('Размер кеша, байт', get_cache_size(session)),
+        ('Попаданий в кеш', cache_stats.hits),
+        ('Промахов кеша', cache_stats.misses),
+        ('Доля попаданий', f'{cache_stats.hit_ratio:.0%}'),
+        ('Вытеснено записей', cache_limit.evicted),
+        ('Страниц без повторного разбора', extract_cache.hits),
+    ]
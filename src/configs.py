@@ -2,14 +2,49 @@ import logging
 from logging.handlers import RotatingFileHandler
 
 import argparse
+from pathlib import Path
 
-from constants import DT_FORMAT, LOG_DIR, LOG_FROMAT, PRETTY_MODE, FILE_MODE
+from constants import (
+    API_SOURCE,
+    ASYNC_CACHE_SUFFIX,
+    ASYNC_ENGINE,
+    BS4_PARSER,
+    CACHE_INDEX_SUFFIX,
+    CACHE_MAX_SIZE,
+    CACHE_NAME,
+    CACHE_URLS_EXPIRE_AFTER,
+    CONNECT_TIMEOUT,
+    DEFAULT_PROCESSES,
+    DEFAULT_WORKERS,
+    DOWNLOAD_SEGMENTS,
+    DT_FORMAT,
+    LOG_DIR,
+    LOG_FROMAT,
+    LXML_PARSER,
+    MEGABYTE,
+    PRETTY_MODE,
+    READ_TIMEOUT,
+    RETRIES,
+    SERVER_HOST,
+    SERVER_PORT,
+    SERVER_RESULTS_TTL,
+    FILE_MODE,
+    HTML_SOURCE,
+    SYNC_ENGINE,
+    SQLITE_BACKEND,
+    SQLITE_MODE,
+    FILESYSTEM_BACKEND,
+    MEMORY_BACKEND,
+)
 
 
 def configure_argument_parser(available_modes):
     parser = argparse.ArgumentParser(description='Парсер документации Python')
     parser.add_argument(
-        'mode', choices=available_modes, help='Режимы работы парсера'
+        'mode',
+        nargs='+',
+        choices=available_modes,
+        help='Режимы работы парсера',
     )
     parser.add_argument(
         '-c', '--clear-cache', action='store_true', help='Очистка кеша'
@@ -17,13 +52,135 @@ def configure_argument_parser(available_modes):
     parser.add_argument(
         '-o',
         '--output',
-        choices=(PRETTY_MODE, FILE_MODE),
+        choices=(PRETTY_MODE, FILE_MODE, SQLITE_MODE),
         help='Дополнительные способы вывода данных',
     )
+    parser.add_argument(
+        '-w',
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help='Количество параллельных загрузок страниц',
+    )
+    parser.add_argument(
+        '-e',
+        '--engine',
+        choices=(SYNC_ENGINE, ASYNC_ENGINE),
+        default=SYNC_ENGINE,
+        help='Способ загрузки страниц',
+    )
+    parser.add_argument(
+        '--connect-timeout',
+        type=float,
+        default=CONNECT_TIMEOUT,
+        help='Тайм-аут подключения, секунд',
+    )
+    parser.add_argument(
+        '--read-timeout',
+        type=float,
+        default=READ_TIMEOUT,
+        help='Тайм-аут чтения ответа, секунд',
+    )
+    parser.add_argument(
+        '--retries',
+        type=int,
+        default=RETRIES,
+        help='Количество повторов неудачного запроса',
+    )
+    parser.add_argument(
+        '--deadline',
+        type=float,
+        help='Лимит времени работы парсера, секунд',
+    )
+    parser.add_argument(
+        '--segments',
+        type=int,
+        default=DOWNLOAD_SEGMENTS,
+        help='Количество частей, загружаемых параллельно для архивов',
+    )
+    parser.add_argument(
+        '-p',
+        '--processes',
+        type=int,
+        default=DEFAULT_PROCESSES,
+        help='Количество процессов для разбора страниц',
+    )
+    parser.add_argument(
+        '-s',
+        '--source',
+        choices=(HTML_SOURCE, API_SOURCE),
+        default=HTML_SOURCE,
+        help='Источник статусов PEP',
+    )
+    parser.add_argument(
+        '--parser',
+        choices=(BS4_PARSER, LXML_PARSER),
+        default=BS4_PARSER,
+        help='Способ разбора HTML',
+    )
+    parser.add_argument(
+        '-i',
+        '--incremental',
+        action='store_true',
+        help='Проверка только изменившихся PEP',
+    )
+    parser.add_argument(
+        '--watch',
+        type=float,
+        metavar='INTERVAL',
+        help='Повторный запуск с заданным интервалом, секунд',
+    )
+    parser.add_argument(
+        '--host',
+        default=SERVER_HOST,
+        help='Адрес API в режиме serve',
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=SERVER_PORT,
+        help='Порт API в режиме serve',
+    )
+    parser.add_argument(
+        '--ttl',
+        type=float,
+        default=SERVER_RESULTS_TTL,
+        help='Срок хранения результатов в API, секунд',
+    )
+    parser.add_argument(
+        '--cache-backend',
+        choices=(SQLITE_BACKEND, FILESYSTEM_BACKEND, MEMORY_BACKEND),
+        default=SQLITE_BACKEND,
+        help='Хранилище кеша',
+    )
+    parser.add_argument(
+        '--cache-name',
+        default=CACHE_NAME,
+        help='Расположение кеша',
+    )
+    parser.add_argument(
+        '--cache-size',
+        type=float,
+        help=(
+            f'Предельный размер кеша, МиБ (по умолчанию {CACHE_MAX_SIZE}, '
+            '0 — без ограничения)'
+        ),
+    )
+    parser.add_argument(
+        '--cache-stats',
+        action='store_true',
+        help='Статистика кеша',
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Замеры времени загрузки и разбора страниц',
+    )
     return parser
 
 
 def configure_logging(filename='parser.log'):
+    LOG_DIR.mkdir(exist_ok=True)
     rotation_handler = RotatingFileHandler(
         LOG_DIR / filename, maxBytes=10**6, backupCount=5
     )
@@ -33,3 +190,44 @@ def configure_logging(filename='parser.log'):
         datefmt=DT_FORMAT,
         handlers=(rotation_handler, logging.StreamHandler()),
     )
+
+
+def configure_session(cli_args):
+    from requests_cache import CachedSession
+
+    from caching import cache_limit, get_compressed_serializer, is_cacheable
+    from utils import mount_connection_pool
+
+    session = CachedSession(
+        cli_args.cache_name,
+        backend=cli_args.cache_backend,
+        serializer=get_compressed_serializer(),
+        filter_fn=is_cacheable,
+        urls_expire_after=CACHE_URLS_EXPIRE_AFTER,
+        always_revalidate=cli_args.watch is not None,
+    )
+    if cli_args.clear_cache:
+        session.cache.clear()
+    if cli_args.engine == ASYNC_ENGINE:
+        from async_utils import async_cache
+
+        async_cache.configure(
+            cli_args.cache_name + ASYNC_CACHE_SUFFIX,
+            cli_args.cache_backend,
+            cli_args.clear_cache,
+        )
+    cache_size = (
+        CACHE_MAX_SIZE if cli_args.cache_size is None else cli_args.cache_size
+    )
+    if cache_size:
+        cache_limit.configure(
+            session.cache,
+            cache_size * MEGABYTE,
+            None
+            if cli_args.cache_backend == MEMORY_BACKEND
+            else Path(cli_args.cache_name + CACHE_INDEX_SUFFIX),
+        )
+    return mount_connection_pool(
+        session,
+        cli_args.workers * max(cli_args.segments, 1) * len(cli_args.mode),
+    )
@@ -4,14 +4,25 @@ from urllib.parse import urljoin
 
 BASE_DIR = Path(__file__).parent
 LOG_DIR = BASE_DIR / 'logs'
-LOG_DIR.mkdir(exist_ok=True)
+PROFILE_FILE = 'profile.jsonl'
 DOWNLOADS_DIR = 'downloads'
+MIRROR_MANIFEST = 'mirror.json'
 RESULTS_DIR = 'results'
+RESULTS_DB = 'results.sqlite3'
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+PART_SUFFIX = '.part'
+ETAG_SUFFIX = '.etag'
+SNAPSHOTS_DIR = 'snapshots'
+PEP_SNAPSHOT = f'{SNAPSHOTS_DIR}/pep.json'
+EXTRACT_CACHE = f'{SNAPSHOTS_DIR}/extracted.sqlite3'
+EXTRACT_CACHE_BATCH = 100
 
 MAIN_DOC_URL = 'https://docs.python.org/3/'
 WHATS_NEW_URL = urljoin(MAIN_DOC_URL, 'whatsnew/')
-DOWNLOADS_URL = urljoin(MAIN_DOC_URL, 'download.html')
+DOWNLOAD_PAGE = 'download.html'
+DOWNLOADS_URL = urljoin(MAIN_DOC_URL, DOWNLOAD_PAGE)
 PEP_TABLE_URL = 'https://peps.python.org/'
+PEP_API_URL = urljoin(PEP_TABLE_URL, 'api/peps.json')
 
 DATETIME_FORMAT = '%Y-%m-%d_%H-%M-%S'
 LOG_FROMAT = '"%(asctime)s - [%(levelname)s] - %(message)s"'
@@ -28,5 +39,74 @@ EXPECTED_STATUS = {
     '': ('Draft', 'Active'),
 }
 
+SQLITE_BACKEND = 'sqlite'
+FILESYSTEM_BACKEND = 'filesystem'
+MEMORY_BACKEND = 'memory'
+CACHE_NAME = 'http_cache'
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+CACHE_URLS_EXPIRE_AFTER = {
+    'peps.python.org/pep-*': DAY,
+    'peps.python.org': HOUR,
+    'docs.python.org/*/whatsnew/3.*.html': 30 * DAY,
+    'docs.python.org': DAY,
+}
+MEGABYTE = 2**20
+CACHE_MAX_SIZE = 64
+CACHE_MAX_RESPONSE_SIZE = 2 * MEGABYTE
+DOWNLOAD_SEGMENTS = 1
+DOWNLOAD_SEGMENT_MIN_SIZE = MEGABYTE
+CACHE_CONTENT_TYPES = ('text/', 'application/json', 'application/xml')
+CACHE_EVICTION_TARGET = 0.9
+CACHE_INDEX_SUFFIX = '_lru.json'
+
+DEFAULT_WORKERS = 1
+IN_FLIGHT_PER_WORKER = 2
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 30
+RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 10
+RATE_LIMIT_INITIAL = 5
+RATE_LIMIT_MIN = 0.5
+RATE_LIMIT_MAX = 100
+RATE_LIMIT_INCREASE = 1
+RATE_LIMIT_DECREASE_FACTOR = 0.5
+RATE_LIMIT_DECREASE_COOLDOWN = 1
+RATE_LIMIT_LATENCY_FACTOR = 2
+RATE_LIMIT_SLOW_SAMPLES = 3
+DEFAULT_PROCESSES = 0
+SYNC_ENGINE = 'sync'
+ASYNC_ENGINE = 'async'
+HTML_SOURCE = 'html'
+API_SOURCE = 'api'
+BS4_PARSER = 'bs4'
+LXML_PARSER = 'lxml'
+ASYNC_CACHE_SUFFIX = '_async'
+
+OUTPUT_BUFFER_ROWS = 100
+OUTPUT_FLUSH_INTERVAL = 1
+
 PRETTY_MODE = 'pretty'
 FILE_MODE = 'file'
+SQLITE_MODE = 'sqlite'
+
+ALL_MODES = 'all'
+SERVE_MODE = 'serve'
+# Режимы, которые загружают архивы на диск: они запускаются только явно
+# и не входят в all и serve.
+EXPLICIT_MODES = ('download', 'mirror')
+PEP_CHANGES_MODE = 'pep-changes'
+# Столбцы, по которым строки режима сопоставляются между проверками --watch.
+WATCH_KEY_COLUMNS = {
+    'whats-new': (0,),
+    'latest-versions': (0,),
+    'pep': (0,),
+    'mirror': (0, 1),
+}
+
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 8000
+SERVER_RESULTS_TTL = 5 * MINUTE
+SERVER_REFRESH_INTERVAL = 1
@@ -1,2 +1,6 @@
 class ParserFindTagException(Exception):
     """Вызывается, когда парсер не может найти тег."""
+
+
+class DownloadCheckException(Exception):
+    """Вызывается, когда загруженный файл не прошёл проверку."""
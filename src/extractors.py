@@ -0,0 +1,52 @@
+from collections import namedtuple
+
+from utils import find_tag
+
+
+PEP_CARD_CLASS = 'rfc2822 field-list simple'
+PEP_CARD_FIELDS = (
+    'author',
+    'sponsor',
+    'pep_delegate',
+    'discussions_to',
+    'status',
+    'type',
+    'topic',
+    'content_type',
+    'requires',
+    'created',
+    'python_version',
+    'post_history',
+    'replaces',
+    'superseded_by',
+    'resolution',
+)
+
+PepCard = namedtuple(
+    'PepCard', PEP_CARD_FIELDS, defaults=(None,) * len(PEP_CARD_FIELDS)
+)
+
+
+def get_field_name(term):
+    name = term.strip().rstrip(':').lower().replace('-', '_')
+    return name if name in PEP_CARD_FIELDS else None
+
+
+def collect_pep_card(tags):
+    fields = {}
+    name = None
+    for tag_name, text in tags:
+        if tag_name == 'dt':
+            name = get_field_name(text)
+        elif name is not None:
+            fields[name] = text.strip()
+            name = None
+    return PepCard(**fields)
+
+
+def extract_pep_card(soup):
+    field_list = find_tag(soup, 'dl', attrs={'class': PEP_CARD_CLASS})
+    return collect_pep_card(
+        (tag.name, tag.text)
+        for tag in field_list.find_all(('dt', 'dd'), recursive=False)
+    )
@@ -0,0 +1,81 @@
+import random
+import time
+from http import HTTPStatus
+from threading import Lock
+
+from constants import (
+    BACKOFF_BASE,
+    BACKOFF_MAX,
+    CONNECT_TIMEOUT,
+    READ_TIMEOUT,
+    RETRIES,
+)
+
+
+RETRY_STATUSES = (
+    HTTPStatus.TOO_MANY_REQUESTS,
+    HTTPStatus.INTERNAL_SERVER_ERROR,
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+)
+DEADLINE_ERROR = 'Время работы парсера истекло'
+MIN_TIMEOUT = 0.1
+
+
+class FetchPolicy:
+    """Тайм-ауты, повторы запросов и общий лимит времени работы парсера."""
+
+    def __init__(self):
+        self.connect_timeout = CONNECT_TIMEOUT
+        self.read_timeout = READ_TIMEOUT
+        self.retries = RETRIES
+        self.deadline = None
+        self.skipped = 0
+        self._lock = Lock()
+
+    def configure(
+        self,
+        connect_timeout=CONNECT_TIMEOUT,
+        read_timeout=READ_TIMEOUT,
+        retries=RETRIES,
+        deadline=None,
+    ):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.deadline = (
+            time.monotonic() + deadline if deadline is not None else None
+        )
+        self.skipped = 0
+
+    def remaining(self):
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    def expired(self):
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def skip(self):
+        with self._lock:
+            self.skipped += 1
+
+    def get_timeout(self):
+        remaining = self.remaining()
+        if remaining is None:
+            return self.connect_timeout, self.read_timeout
+        remaining = max(remaining, MIN_TIMEOUT)
+        return (
+            min(self.connect_timeout, remaining),
+            min(self.read_timeout, remaining),
+        )
+
+    def get_backoff(self, attempt):
+        delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt))
+        remaining = self.remaining()
+        return delay if remaining is None else min(delay, max(remaining, 0))
+
+
+fetch_policy = FetchPolicy()
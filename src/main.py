@@ -1,29 +1,88 @@
 import logging
 import re
+import time
+from argparse import Namespace
 from collections import defaultdict
+from functools import partial
 from urllib.parse import urljoin
 
-from requests_cache import CachedSession
-from tqdm import tqdm
-
-from configs import configure_argument_parser, configure_logging
+from caching import cache_limit, extract_cache, get_cache_stats
+from configs import (
+    configure_argument_parser,
+    configure_logging,
+    configure_session,
+)
 from constants import (
+    ALL_MODES,
     BASE_DIR,
+    SERVE_MODE,
+    EXPLICIT_MODES,
+    LOG_DIR,
     MAIN_DOC_URL,
     PEP_TABLE_URL,
+    PEP_API_URL,
+    API_SOURCE,
+    HTML_SOURCE,
+    BS4_PARSER,
     EXPECTED_STATUS,
     WHATS_NEW_URL,
     DOWNLOADS_URL,
     DOWNLOADS_DIR,
+    DOWNLOAD_PAGE,
+    MIRROR_MANIFEST,
+    DEFAULT_PROCESSES,
+    DEFAULT_WORKERS,
+    DOWNLOAD_SEGMENTS,
+    SYNC_ENGINE,
+    ASYNC_ENGINE,
+    PEP_SNAPSHOT,
+    PEP_CHANGES_MODE,
+    WATCH_KEY_COLUMNS,
+    EXTRACT_CACHE,
+    PROFILE_FILE,
+)
+from exceptions import DownloadCheckException
+from extractors import PEP_CARD_CLASS
+from fetch_policy import fetch_policy
+from outputs import control_output, pretty_output
+from parsers import EXTRACTOR_VERSIONS, PARSERS
+from profiling import (
+    dump_profile,
+    get_profile_summary,
+    get_slowest_urls,
+    profiler,
+)
+from utils import (
+    download_file,
+    download_file_state,
+    get_file_state,
+    get_page,
+    get_response,
+    load_snapshot,
+    map_concurrently,
+    map_in_processes,
+    save_snapshot,
+    show_progress,
 )
-from outputs import control_output
-from utils import find_tag, cook_soup
 
 
 NOT_FOUND_ERROR_FORMAT = (
     'При поиске по ссылке {url} в ' 'теге <{tag_name}> ничего не нашлось'
 )
 DOWNLOAD_COMPLETE_FORMAT = 'Архив был загружен и сохранён: {archive_path}'
+DOWNLOAD_DIGEST_FORMAT = 'Контрольная сумма SHA-256 архива: {digest}'
+DEADLINE_SKIPPED_FORMAT = (
+    'Лимит времени работы исчерпан, пропущено страниц: {count}'
+)
+API_ERROR_FORMAT = (
+    'Не удалось загрузить метаданные PEP, статусы будут взяты из карточек. '
+    '{error}'
+)
+API_FORMAT_ERROR = 'Индекс PEP должен быть JSON-объектом'
+MIRROR_DOWNLOADED = 'Загружен'
+MIRROR_UNCHANGED = 'Без изменений'
+MIRROR_FAILED = 'Ошибка'
+PROFILE_SAVED_FORMAT = 'Замеры по страницам были сохранены: {file_path}'
 LOGS_ARGS_FORMAT = 'Аргументы командной строки {args}'
 INCONGRUITY_STATUSES_FORMAT = (
     '{packet_url}'
@@ -33,108 +92,384 @@ INCONGRUITY_STATUSES_FORMAT = (
 START_PARSING = 'Парсер запущен!'
 END_PARSING = 'Парсер завершил работу.'
 BASE_ERROR = 'При работе программы возникла ошибка. {error}'
+MODE_ERROR_FORMAT = 'При работе режима {mode} возникла ошибка. {error}'
+MODE_RESULTS_FORMAT = 'Результаты режима {mode}'
+WATCH_CYCLE_FORMAT = (
+    'Проверка завершена, изменений: {changes}. '
+    'Следующая через {delay:.0f} с'
+)
+WATCH_STOPPED = 'Наблюдение остановлено.'
+SERVE_DEADLINE_ERROR = (
+    'Аргумент --deadline нельзя использовать с режимом serve: лимит времени '
+    'отсчитывается от запуска парсера'
+)
+ASYNC_CACHE_SIZE_ERROR = (
+    'Аргумент --cache-size нельзя использовать с --engine async: размер '
+    'кеша асинхронного движка не ограничивается'
+)
+PEP_CHANGES_HEADER = ('Номер PEP', 'Был статус', 'Стал статус')
 
+WHATS_NEW_INDEX_TARGET = {'id': 'what-s-new-in-python'}
+WHATS_NEW_TARGET = {'name': ('h1', 'dl')}
+LATEST_VERSIONS_TARGET = {
+    'name': 'div',
+    'attrs': {'class': 'sphinxsidebarwrapper'},
+}
+DOWNLOAD_TARGET = {
+    'name': 'table',
+    'attrs': {'class': re.compile(r'\bdocutils\b')},
+}
+PEP_INDEX_TARGET = {'name': 'section', 'attrs': {'id': 'numerical-index'}}
+PEP_CARD_TARGET = {'name': 'dl', 'attrs': {'class': PEP_CARD_CLASS}}
 
-def whats_new(session):
-    logs = []
-    soup = cook_soup(session, WHATS_NEW_URL)
-    sections = soup.select(
-        '#what-s-new-in-python div.toctree-wrapper li.toctree-l1 > a'
-    )
-    result = [('Ссылка на статью', 'Заголовок', 'Редактор, Автор')]
-    for a_tag in tqdm(sections, colour='GREEN'):
-        version_link = urljoin(WHATS_NEW_URL, a_tag['href'])
-        try:
-            soup = cook_soup(session, version_link)
-            result.append(
-                (
-                    version_link,
-                    find_tag(soup, 'h1').text,
-                    find_tag(soup, 'dl').text.replace('\n', ' '),
-                )
-            )
-        except ConnectionError as error:
-            logs.append(error)
-    for log in logs:
-        logging.error(log)
-    return result
+
+def fetch_pages(session, urls, workers, engine, refresh=False):
+    if engine == ASYNC_ENGINE:
+        from async_utils import fetch_texts
+
+        return fetch_texts(urls, workers, refresh=refresh)
+    return map_concurrently(
+        partial(get_page, session, refresh=refresh), urls, workers
+    )
 
 
-def latest_versions(session):
-    soup = cook_soup(session, MAIN_DOC_URL)
-    a_tags = soup.select(
-        'div.sphinxsidebarwrapper ul:-soup-contains("All versions") a'
+def cook_tree(session, url, html_parser, target=None):
+    page = get_response(session, url).text
+    with profiler.phase(url, 'parse'):
+        return html_parser.parse(page, target)
+
+
+def extract_whats_new_article(version_link, page, parser=BS4_PARSER):
+    html_parser = PARSERS[parser]
+    with profiler.phase(version_link, 'parse'):
+        tree = html_parser.parse(page, WHATS_NEW_TARGET)
+    try:
+        with profiler.phase(version_link, 'extract'):
+            return html_parser.whats_new_article(tree)
+    finally:
+        html_parser.release(tree)
+
+
+def parse_whats_new_page(version_link, page, parser=BS4_PARSER):
+    if isinstance(page, ConnectionError):
+        return page
+    article = extract_cache.get_or_extract(
+        version_link,
+        'whats_new_article',
+        parser,
+        page,
+        partial(extract_whats_new_article, version_link, parser=parser),
     )
+    return (version_link, *article)
+
+
+def whats_new(
+    session,
+    workers=DEFAULT_WORKERS,
+    engine=SYNC_ENGINE,
+    processes=DEFAULT_PROCESSES,
+    parser=BS4_PARSER,
+):
+    html_parser = PARSERS[parser]
+    tree = cook_tree(
+        session, WHATS_NEW_URL, html_parser, WHATS_NEW_INDEX_TARGET
+    )
+    version_links = [
+        urljoin(WHATS_NEW_URL, href)
+        for href in html_parser.whats_new_links(tree)
+    ]
+    pages = fetch_pages(session, version_links, workers, engine)
+    rows = map_in_processes(
+        partial(parse_whats_new_page, parser=parser),
+        version_links,
+        pages,
+        processes=processes,
+    )
+    yield ('Ссылка на статью', 'Заголовок', 'Редактор, Автор')
+    for row in show_progress(rows, total=len(version_links), colour='GREEN'):
+        if isinstance(row, ConnectionError):
+            logging.error(row)
+            continue
+        yield row
+
+
+def latest_versions(session, parser=BS4_PARSER):
+    html_parser = PARSERS[parser]
+    tree = cook_tree(
+        session, MAIN_DOC_URL, html_parser, LATEST_VERSIONS_TARGET
+    )
+    a_tags = html_parser.version_links(tree)
     if a_tags is None:
         raise ValueError(
             NOT_FOUND_ERROR_FORMAT.format(url=MAIN_DOC_URL, tag_name='ul')
         )
     result = []
-    for a_tag in a_tags:
+    for href, text in a_tags:
         match = re.search(
-            r'Python (?P<version>\d.\d+) \((?P<status>.*)\)', a_tag.text
+            r'Python (?P<version>\d.\d+) \((?P<status>.*)\)', text
         )
         if match:
-            result.append((a_tag['href'],) + match.groups())
+            result.append((href,) + match.groups())
         else:
-            result.append((a_tag['href'], a_tag.text))
+            result.append((href, text))
     return result
 
 
-def download(session):
-    soup = cook_soup(session, DOWNLOADS_URL)
-    pdf_a4_link = soup.select_one('table.docutils a[href$="pdf-a4.zip"]')[
-        'href'
-    ]
+def download(session, parser=BS4_PARSER, segments=DOWNLOAD_SEGMENTS):
+    html_parser = PARSERS[parser]
+    tree = cook_tree(session, DOWNLOADS_URL, html_parser, DOWNLOAD_TARGET)
+    pdf_a4_link = html_parser.archive_link(tree)
     archive_url = urljoin(DOWNLOADS_URL, pdf_a4_link)
     filename = archive_url.split('/')[-1]
-    response = session.get(archive_url)
     downloads_dir = BASE_DIR / DOWNLOADS_DIR
     downloads_dir.mkdir(exist_ok=True)
-    with open(downloads_dir / filename, 'wb') as file:
-        file.write(response.content)
+    digest = download_file(
+        session, archive_url, downloads_dir / filename, segments=segments
+    )
     logging.info(DOWNLOAD_COMPLETE_FORMAT.format(archive_path=downloads_dir))
+    logging.info(DOWNLOAD_DIGEST_FORMAT.format(digest=digest))
 
 
-def pep(session):
-    soup = cook_soup(session, PEP_TABLE_URL)
-    section_block = find_tag(soup, 'section', attrs={'id': 'numerical-index'})
-    table = find_tag(section_block, 'tbody')
-    results = defaultdict(int)
-    logs = []
-    for table_line in tqdm(table.find_all('tr')):
-        main_table_status = find_tag(table_line, 'td').text[1:]
-        url = find_tag(table_line, 'a').get('href')
-        packet_url = urljoin(PEP_TABLE_URL, url)
-        try:
-            packet_soup = cook_soup(session, packet_url)
-            packet_info = find_tag(
-                packet_soup, 'dl', attrs={'class': 'rfc2822 field-list simple'}
-            )
-            card_status = (
-                packet_info.find(text=re.compile('Status.*'))
-                .parent.find_next_sibling()
-                .text
-            )
-            expected = EXPECTED_STATUS.get(main_table_status)
-            if card_status not in expected:
-                logs.append(
-                    INCONGRUITY_STATUSES_FORMAT.format(
-                        packet_url=packet_url,
-                        card_status=card_status,
-                        expected=expected,
-                    )
-                )
-            packet_status = (
-                packet_info.find(text=re.compile('Status.*'))
-                .parent.find_next_sibling()
-                .text
-            )
-            results[packet_status] += 1
-        except ConnectionError as error:
-            logs.append(error)
-    for log in logs:
+def get_archive_urls(session, version_url, parser=BS4_PARSER):
+    html_parser = PARSERS[parser]
+    download_url = urljoin(version_url, DOWNLOAD_PAGE)
+    try:
+        tree = cook_tree(session, download_url, html_parser, DOWNLOAD_TARGET)
+    except ConnectionError as error:
+        logging.error(error)
+        return []
+    return [
+        urljoin(download_url, href)
+        for href in html_parser.archive_links(tree)
+    ]
+
+
+def is_mirrored(path, state, known_state):
+    if not path.exists() or state != known_state:
+        return False
+    if state['size'] is not None:
+        return path.stat().st_size == state['size']
+    return state['etag'] is not None
+
+
+def mirror_archive(session, known_states, segments, archive):
+    version, url = archive
+    path = BASE_DIR / DOWNLOADS_DIR / version / url.split('/')[-1]
+    try:
+        state = get_file_state(session, url)
+        if is_mirrored(path, state, known_states.get(url)):
+            return version, url, MIRROR_UNCHANGED, state
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _, state = download_file_state(
+            session, url, path, segments=segments
+        )
+    except (ConnectionError, DownloadCheckException) as error:
+        logging.error(error)
+        return version, url, MIRROR_FAILED, None
+    return version, url, MIRROR_DOWNLOADED, state
+
+
+def mirror(
+    session,
+    workers=DEFAULT_WORKERS,
+    parser=BS4_PARSER,
+    segments=DOWNLOAD_SEGMENTS,
+):
+    versions = [
+        (row[1], row[0])
+        for row in latest_versions(session, parser)
+        if len(row) == 3
+    ]
+    archive_urls = map_concurrently(
+        partial(get_archive_urls, session, parser=parser),
+        [href for _, href in versions],
+        workers,
+    )
+    archives = [
+        (version, url)
+        for (version, _), urls in zip(versions, archive_urls)
+        for url in urls
+    ]
+    manifest_path = BASE_DIR / DOWNLOADS_DIR / MIRROR_MANIFEST
+    manifest = load_snapshot(manifest_path)
+    results = [('Версия', 'Архив', 'Результат')]
+    mirrored = map_concurrently(
+        partial(mirror_archive, session, dict(manifest), segments),
+        archives,
+        workers,
+    )
+    for version, url, result, state in show_progress(
+        mirrored, total=len(archives)
+    ):
+        results.append((version, url.split('/')[-1], result))
+        if state is not None:
+            manifest[url] = state
+    save_snapshot(manifest, manifest_path)
+    return results
+
+
+def check_pep_status(table_row, card_status):
+    main_table_status, packet_url = table_row
+    expected = EXPECTED_STATUS.get(main_table_status, ())
+    if card_status not in expected:
+        return INCONGRUITY_STATUSES_FORMAT.format(
+            packet_url=packet_url,
+            card_status=card_status,
+            expected=expected,
+        )
+    return None
+
+
+def extract_pep_status(packet_url, page, parser=BS4_PARSER):
+    html_parser = PARSERS[parser]
+    with profiler.phase(packet_url, 'parse'):
+        tree = html_parser.parse(page, PEP_CARD_TARGET)
+    try:
+        with profiler.phase(packet_url, 'extract'):
+            return html_parser.pep_card(tree).status
+    finally:
+        html_parser.release(tree)
+
+
+def check_pep_page(table_row, page, parser=BS4_PARSER):
+    if isinstance(page, ConnectionError):
+        return None, page
+    packet_url = table_row[1]
+    card_status = extract_cache.get_or_extract(
+        packet_url,
+        'pep_card',
+        parser,
+        page,
+        partial(extract_pep_status, packet_url, parser=parser),
+    )
+    return card_status, check_pep_status(table_row, card_status)
+
+
+def check_pep_card(
+    session, table_row, parser=BS4_PARSER, refresh=False
+):
+    return check_pep_page(
+        table_row,
+        get_page(session, table_row[1], refresh=refresh),
+        parser,
+    )
+
+
+def get_pep_rows(session, parser=BS4_PARSER):
+    html_parser = PARSERS[parser]
+    tree = cook_tree(session, PEP_TABLE_URL, html_parser, PEP_INDEX_TARGET)
+    try:
+        return {
+            number: (table_status[1:], urljoin(PEP_TABLE_URL, href))
+            for number, table_status, href in html_parser.pep_rows(tree)
+        }
+    finally:
+        html_parser.release(tree)
+
+
+def get_api_statuses(session, pep_rows, numbers):
+    try:
+        entries = get_response(session, PEP_API_URL).json()
+        if not isinstance(entries, dict):
+            raise ValueError(API_FORMAT_ERROR)
+    except (ConnectionError, ValueError) as error:
+        logging.error(API_ERROR_FORMAT.format(error=error))
+        return {}
+    statuses = {}
+    for number in numbers:
+        entry = entries.get(number)
+        status = entry.get('status') if isinstance(entry, dict) else None
+        if status in EXPECTED_STATUS.get(pep_rows[number][0], ()):
+            statuses[number] = status
+    return statuses
+
+
+def check_pep_cards(
+    session,
+    table_rows,
+    workers,
+    engine,
+    processes,
+    parser=BS4_PARSER,
+    refresh=False,
+):
+    if engine == ASYNC_ENGINE or processes:
+        pages = fetch_pages(
+            session,
+            [url for _, url in table_rows],
+            workers,
+            engine,
+            refresh,
+        )
+        return map_in_processes(
+            partial(check_pep_page, parser=parser),
+            table_rows,
+            pages,
+            processes=processes,
+        )
+    return map_concurrently(
+        partial(
+            check_pep_card, session, parser=parser, refresh=refresh
+        ),
+        table_rows,
+        workers,
+    )
+
+
+def log_pep_check(log):
+    if log is not None:
         logging.info(log)
+
+
+def pep(
+    session,
+    workers=DEFAULT_WORKERS,
+    engine=SYNC_ENGINE,
+    processes=DEFAULT_PROCESSES,
+    incremental=False,
+    source=HTML_SOURCE,
+    parser=BS4_PARSER,
+):
+    pep_rows = get_pep_rows(session, parser)
+    snapshot_path = BASE_DIR / PEP_SNAPSHOT
+    snapshot = load_snapshot(snapshot_path) if incremental else {}
+    # Из снимка берутся только совпавшие статусы: PEP с расхождением
+    # проверяются заново, пока карточка не обновится.
+    card_statuses = {
+        number: snapshot[number][1]
+        for number, (table_status, _) in pep_rows.items()
+        if number in snapshot
+        and snapshot[number][0] == table_status
+        and snapshot[number][1] in EXPECTED_STATUS.get(table_status, ())
+    }
+    changed = [number for number in pep_rows if number not in card_statuses]
+    if source == API_SOURCE:
+        card_statuses.update(get_api_statuses(session, pep_rows, changed))
+        changed = [number for number in changed if number not in card_statuses]
+    table_rows = [pep_rows[number] for number in changed]
+    # Закешированная карточка может быть старше индекса: статус PEP,
+    # изменившегося с прошлого запуска, загружается заново.
+    checked_cards = check_pep_cards(
+        session, table_rows, workers, engine, processes, parser, incremental
+    )
+    for number, (card_status, log) in zip(
+        changed, show_progress(checked_cards, total=len(table_rows))
+    ):
+        if card_status is not None:
+            card_statuses[number] = card_status
+        log_pep_check(log)
+    save_snapshot(
+        {
+            number: (pep_rows[number][0], card_statuses[number])
+            for number in pep_rows
+            if number in card_statuses
+        },
+        snapshot_path,
+    )
+    results = defaultdict(int)
+    for number in pep_rows:
+        if number in card_statuses:
+            results[card_statuses[number]] += 1
     return [
         ('Статус', 'Количество'),
         *results.items(),
@@ -147,23 +482,226 @@ MODE_TO_FUNCTION = {
     'latest-versions': latest_versions,
     'download': download,
     'pep': pep,
+    'mirror': mirror,
 }
 
 
+def run_mode(session, cli_args):
+    import inspect
+
+    function = MODE_TO_FUNCTION[cli_args.mode]
+    options = {
+        name: value
+        for name, value in vars(cli_args).items()
+        if name in inspect.signature(function).parameters
+    }
+    return function(session, **options)
+
+
+def get_modes(modes):
+    if ALL_MODES in modes or SERVE_MODE in modes:
+        return [
+            mode for mode in MODE_TO_FUNCTION if mode not in EXPLICIT_MODES
+        ]
+    return list(dict.fromkeys(modes))
+
+
+def get_mode_args(cli_args, **changes):
+    return Namespace(**{**vars(cli_args), **changes})
+
+
+def collect_mode(session, cli_args):
+    try:
+        results = run_mode(session, cli_args)
+        return None if results is None else list(results)
+    except Exception as error:
+        logging.exception(
+            MODE_ERROR_FORMAT.format(mode=cli_args.mode, error=error),
+            stack_info=True,
+        )
+        return None
+
+
+def run_modes(session, cli_args, collect=False):
+    modes_args = [get_mode_args(cli_args, mode=mode) for mode in cli_args.mode]
+    if len(modes_args) == 1 and not collect:
+        yield modes_args[0], run_mode(session, modes_args[0])
+        return
+    yield from zip(
+        modes_args,
+        map_concurrently(
+            partial(collect_mode, session), modes_args, len(modes_args)
+        ),
+    )
+
+
+def compute_mode(session, cli_args, mode):
+    results = run_mode(session, get_mode_args(cli_args, mode=mode))
+    results = None if results is None else list(results)
+    extract_cache.save()
+    return results
+
+
+def serve_modes(session, cli_args):
+    from server import serve
+
+    # Отдаются только режимы со строками результата: download и mirror
+    # загружают архивы на диск и на запросы отвечают 404.
+    serve(
+        partial(compute_mode, session, cli_args),
+        get_modes([SERVE_MODE]),
+        cli_args.host,
+        cli_args.port,
+        cli_args.ttl,
+    )
+
+
+def output_results(session, cli_args):
+    for mode_args, results in run_modes(session, cli_args):
+        if results is None:
+            continue
+        if len(cli_args.mode) > 1:
+            logging.info(MODE_RESULTS_FORMAT.format(mode=mode_args.mode))
+        control_output(results, mode_args)
+
+
+def get_changed_rows(known_rows, results, key_columns=(0,)):
+    header, *rows = results
+    current = {
+        tuple(row[column] for column in key_columns): tuple(row)
+        for row in rows
+    }
+    changed = [
+        row for key, row in current.items() if known_rows.get(key) != row
+    ]
+    changed.extend(
+        tuple(
+            value if column in key_columns else ''
+            for column, value in enumerate(row)
+        )
+        for key, row in known_rows.items()
+        if key not in current
+    )
+    known_rows.clear()
+    known_rows.update(current)
+    return [header, *changed] if changed else None
+
+
+def get_pep_statuses():
+    return {
+        number: card_status
+        for number, (_, card_status) in load_snapshot(
+            BASE_DIR / PEP_SNAPSHOT
+        ).items()
+    }
+
+
+def get_pep_changes(known_statuses):
+    statuses = get_pep_statuses()
+    changed = [
+        (number, known_statuses.get(number, ''), statuses.get(number, ''))
+        for number in {**known_statuses, **statuses}
+        if known_statuses.get(number) != statuses.get(number)
+    ]
+    known_statuses.clear()
+    known_statuses.update(statuses)
+    return [PEP_CHANGES_HEADER, *changed] if changed else None
+
+
+def get_changes(known_rows, mode_args, results):
+    if mode_args.mode == 'pep':
+        return (
+            get_mode_args(mode_args, mode=PEP_CHANGES_MODE),
+            get_pep_changes(known_rows[PEP_CHANGES_MODE]),
+        )
+    return mode_args, get_changed_rows(
+        known_rows[mode_args.mode],
+        results,
+        WATCH_KEY_COLUMNS.get(mode_args.mode, (0,)),
+    )
+
+
+def watch(session, cli_args):
+    cli_args = get_mode_args(cli_args, incremental=True)
+    known_rows = defaultdict(dict)
+    known_rows[PEP_CHANGES_MODE] = get_pep_statuses()
+    try:
+        while True:
+            started = time.monotonic()
+            fetch_policy.configure(
+                cli_args.connect_timeout,
+                cli_args.read_timeout,
+                cli_args.retries,
+                cli_args.deadline,
+            )
+            changes = 0
+            for mode_args, results in run_modes(
+                session, cli_args, collect=True
+            ):
+                if results is None:
+                    continue
+                mode_args, changed = get_changes(
+                    known_rows, mode_args, results
+                )
+                if changed is not None:
+                    changes += len(changed) - 1
+                    control_output(changed, mode_args)
+            extract_cache.save()
+            delay = max(0, cli_args.watch - (time.monotonic() - started))
+            logging.info(
+                WATCH_CYCLE_FORMAT.format(changes=changes, delay=delay)
+            )
+            time.sleep(delay)
+    except KeyboardInterrupt:
+        logging.info(WATCH_STOPPED)
+
+
 def main():
     configure_logging()
     logging.info(START_PARSING)
-    arg_parser = configure_argument_parser(MODE_TO_FUNCTION.keys())
+    arg_parser = configure_argument_parser(
+        [*MODE_TO_FUNCTION, ALL_MODES, SERVE_MODE]
+    )
     args = arg_parser.parse_args()
+    serving = SERVE_MODE in args.mode
+    if serving and args.deadline is not None:
+        arg_parser.error(SERVE_DEADLINE_ERROR)
+    if args.engine == ASYNC_ENGINE and args.cache_size is not None:
+        arg_parser.error(ASYNC_CACHE_SIZE_ERROR)
+    args.mode = get_modes(args.mode)
     logging.info(LOGS_ARGS_FORMAT.format(args=args))
+    profiler.enabled = args.profile
+    extract_cache.configure(
+        BASE_DIR / EXTRACT_CACHE, EXTRACTOR_VERSIONS, clear=args.clear_cache
+    )
+    fetch_policy.configure(
+        args.connect_timeout, args.read_timeout, args.retries, args.deadline
+    )
     try:
-        session = CachedSession()
-        if args.clear_cache:
-            session.cache.clear()
-        parser_mode = args.mode
-        results = MODE_TO_FUNCTION[parser_mode](session)
-        if results is not None:
-            control_output(results, args)
+        session = configure_session(args)
+        if serving:
+            serve_modes(session, args)
+        elif args.watch is not None:
+            watch(session, args)
+        else:
+            output_results(session, args)
+        cache_limit.save()
+        extract_cache.save()
+        if args.cache_stats:
+            pretty_output(get_cache_stats(session))
+        if args.profile:
+            from ratelimit import get_rate_limiter_stats
+
+            profile_path = LOG_DIR / PROFILE_FILE
+            dump_profile(profile_path)
+            logging.info(PROFILE_SAVED_FORMAT.format(file_path=profile_path))
+            pretty_output(get_profile_summary())
+            pretty_output(get_slowest_urls())
+            pretty_output(get_rate_limiter_stats())
+        if fetch_policy.skipped:
+            logging.warning(
+                DEADLINE_SKIPPED_FORMAT.format(count=fetch_policy.skipped)
+            )
     except Exception as error:
         logging.exception(
             BASE_ERROR.format(error=error),
@@ -1,19 +1,50 @@
 import csv
 import datetime as dt
 import logging
-
-from prettytable import PrettyTable
+import sys
+from threading import Event, Lock, Thread
 
 from constants import (
     BASE_DIR,
     DATETIME_FORMAT,
     RESULTS_DIR,
     FILE_MODE,
+    OUTPUT_BUFFER_ROWS,
+    OUTPUT_FLUSH_INTERVAL,
+    PEP_SNAPSHOT,
     PRETTY_MODE,
+    RESULTS_DB,
+    SQLITE_MODE,
 )
 
 
 FILE_SAVED_FORMAT = 'Файл с результатами был сохранён: {file_path}'
+DB_SAVED_FORMAT = 'Результаты запуска {run_id} были сохранены: {file_path}'
+
+
+def flush_periodically(file, lock, stopped):
+    while not stopped.wait(OUTPUT_FLUSH_INTERVAL):
+        with lock:
+            file.flush()
+
+
+def write_rows(rows, write_row, file):
+    lock = Lock()
+    stopped = Event()
+    flusher = Thread(
+        target=flush_periodically, args=(file, lock, stopped), daemon=True
+    )
+    flusher.start()
+    try:
+        for count, row in enumerate(rows, 1):
+            with lock:
+                write_row(row)
+                if count % OUTPUT_BUFFER_ROWS == 0:
+                    file.flush()
+    finally:
+        stopped.set()
+        flusher.join()
+        file.flush()
 
 
 def file_output(results, cli_args):
@@ -24,26 +55,46 @@ def file_output(results, cli_args):
     file_name = f'{parser_mode}_{datetime}.csv'
     file_path = results_dir / file_name
     with open(file_path, 'w', encoding='UTF-8') as file:
-        csv.writer(file, dialect=csv.unix_dialect).writerows(results)
+        writer = csv.writer(file, dialect=csv.unix_dialect)
+        write_rows(results, writer.writerow, file)
     logging.info(FILE_SAVED_FORMAT.format(file_path=file_path))
 
 
+def sqlite_output(results, cli_args):
+    from storage import save_results
+    from utils import load_snapshot
+
+    results_dir = BASE_DIR / RESULTS_DIR
+    results_dir.mkdir(exist_ok=True)
+    file_path = results_dir / RESULTS_DB
+    pep_cards = (
+        load_snapshot(BASE_DIR / PEP_SNAPSHOT)
+        if cli_args.mode == 'pep'
+        else None
+    )
+    run_id = save_results(file_path, cli_args.mode, results, pep_cards)
+    logging.info(DB_SAVED_FORMAT.format(run_id=run_id, file_path=file_path))
+
+
 def pretty_output(results, *args):
+    from prettytable import PrettyTable
+
+    rows = iter(results)
     table = PrettyTable()
-    table.field_names = results[0]
+    table.field_names = next(rows)
     table.align = 'l'
-    table.add_rows(results[1:])
+    table.add_rows(list(rows))
     print(table)
 
 
 def default_output(results, *args):
-    for row in results:
-        print(*row)
+    write_rows(results, lambda row: print(*row), sys.stdout)
 
 
 OUTPUT_TO_FUNCTIONS = {
     PRETTY_MODE: pretty_output,
     FILE_MODE: file_output,
+    SQLITE_MODE: sqlite_output,
     None: default_output,
 }
 
@@ -0,0 +1,144 @@
+from constants import BS4_PARSER, LXML_PARSER
+from extractors import PEP_CARD_CLASS, collect_pep_card, extract_pep_card
+from utils import find_tag, find_xpath, make_soup
+
+
+def has_class(name):
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+WHATS_NEW_LINKS_XPATH = (
+    f'//*[@id="what-s-new-in-python"]//div[{has_class("toctree-wrapper")}]'
+    f'//li[{has_class("toctree-l1")}]/a'
+)
+VERSION_LINKS_XPATH = (
+    f'//div[{has_class("sphinxsidebarwrapper")}]'
+    '//ul[contains(., "All versions")]//a'
+)
+ARCHIVE_LINK_XPATH = (
+    f'//table[{has_class("docutils")}]//a[substring(@href, '
+    'string-length(@href) - string-length("pdf-a4.zip") + 1) = "pdf-a4.zip"]'
+)
+ARCHIVE_LINKS_XPATH = f'//table[{has_class("docutils")}]//a/@href'
+PEP_CARD_XPATH = f'//dl[@class="{PEP_CARD_CLASS}"]'
+# При изменении извлекаемых данных увеличьте версию: сохранённые в кеше
+# результаты этого извлечения перестанут использоваться.
+EXTRACTOR_VERSIONS = {
+    'pep_card': 1,
+    'whats_new_article': 1,
+}
+
+
+class SoupParser:
+    """Извлечение данных из дерева BeautifulSoup."""
+
+    def parse(self, page, target=None):
+        return make_soup(page, parse_only=target)
+
+    def release(self, tree):
+        tree.decompose()
+
+    def whats_new_links(self, tree):
+        return [
+            a_tag['href']
+            for a_tag in tree.select(
+                '#what-s-new-in-python div.toctree-wrapper li.toctree-l1 > a'
+            )
+        ]
+
+    def whats_new_article(self, tree):
+        return (
+            find_tag(tree, 'h1').text,
+            find_tag(tree, 'dl').text.replace('\n', ' '),
+        )
+
+    def version_links(self, tree):
+        return [
+            (a_tag['href'], a_tag.text)
+            for a_tag in tree.select(
+                'div.sphinxsidebarwrapper ul:-soup-contains("All versions") a'
+            )
+        ]
+
+    def archive_link(self, tree):
+        return tree.select_one('table.docutils a[href$="pdf-a4.zip"]')['href']
+
+    def archive_links(self, tree):
+        return [
+            a_tag['href'] for a_tag in tree.select('table.docutils a[href]')
+        ]
+
+    def pep_rows(self, tree):
+        section_block = find_tag(
+            tree, 'section', attrs={'id': 'numerical-index'}
+        )
+        table = find_tag(section_block, 'tbody')
+        for table_line in table.find_all('tr'):
+            a_tag = find_tag(table_line, 'a')
+            yield (
+                a_tag.text,
+                find_tag(table_line, 'td').text,
+                a_tag.get('href'),
+            )
+
+    def pep_card(self, tree):
+        return extract_pep_card(tree)
+
+
+class LxmlParser:
+    """Извлечение данных из дерева lxml.html с помощью XPath."""
+
+    def parse(self, page, target=None):
+        from lxml import html
+
+        return html.fromstring(page)
+
+    def release(self, tree):
+        tree.clear()
+
+    def whats_new_links(self, tree):
+        return [
+            a_tag.get('href') for a_tag in tree.xpath(WHATS_NEW_LINKS_XPATH)
+        ]
+
+    def whats_new_article(self, tree):
+        return (
+            find_xpath(tree, '//h1').text_content(),
+            find_xpath(tree, '//dl').text_content().replace('\n', ' '),
+        )
+
+    def version_links(self, tree):
+        return [
+            (a_tag.get('href'), a_tag.text_content())
+            for a_tag in tree.xpath(VERSION_LINKS_XPATH)
+        ]
+
+    def archive_link(self, tree):
+        return find_xpath(tree, ARCHIVE_LINK_XPATH).get('href')
+
+    def archive_links(self, tree):
+        return [str(href) for href in tree.xpath(ARCHIVE_LINKS_XPATH)]
+
+    def pep_rows(self, tree):
+        section_block = find_xpath(tree, '//section[@id="numerical-index"]')
+        table = find_xpath(section_block, './/tbody')
+        for table_line in table.xpath('.//tr'):
+            a_tag = find_xpath(table_line, './/a')
+            yield (
+                a_tag.text_content(),
+                find_xpath(table_line, './/td').text_content(),
+                a_tag.get('href'),
+            )
+
+    def pep_card(self, tree):
+        field_list = find_xpath(tree, PEP_CARD_XPATH)
+        return collect_pep_card(
+            (tag.tag, tag.text_content())
+            for tag in field_list.xpath('./dt | ./dd')
+        )
+
+
+PARSERS = {
+    BS4_PARSER: SoupParser(),
+    LXML_PARSER: LxmlParser(),
+}
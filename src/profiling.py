@@ -0,0 +1,119 @@
+import json
+import math
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from threading import Lock
+
+
+PHASES = ('fetch', 'parse', 'extract')
+SLOWEST_URLS_COUNT = 10
+
+
+class PhaseTimer:
+    """Замеряет длительность одного этапа обработки страницы."""
+
+    def __init__(self, profiler, url, phase):
+        self.profiler = profiler
+        self.url = url
+        self.phase = phase
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.add(
+            self.url, self.phase, time.perf_counter() - self.started
+        )
+
+
+class Profiler:
+    """Собирает замеры по каждой странице, пока включён флаг `--profile`."""
+
+    def __init__(self):
+        self.enabled = False
+        self.records = defaultdict(dict)
+        self._lock = Lock()
+
+    def phase(self, url, phase):
+        if not self.enabled:
+            return nullcontext()
+        return PhaseTimer(self, url, phase)
+
+    def add(self, url, phase, elapsed):
+        with self._lock:
+            record = self.records[url]
+            record[phase] = record.get(phase, 0) + elapsed
+
+    def record(self, url, **fields):
+        with self._lock:
+            self.records[url].update(fields)
+
+    def export(self):
+        with self._lock:
+            records = dict(self.records)
+            self.records.clear()
+        return records
+
+    def merge(self, records):
+        with self._lock:
+            for url, record in records.items():
+                self.records[url].update(record)
+
+
+profiler = Profiler()
+
+
+def percentile(values, share):
+    ordered = sorted(values)
+    return ordered[max(math.ceil(share * len(ordered)) - 1, 0)]
+
+
+def dump_profile(path):
+    with open(path, 'w', encoding='UTF-8') as file:
+        for url, record in profiler.records.items():
+            file.write(
+                json.dumps({'url': url, **record}, ensure_ascii=False) + '\n'
+            )
+
+
+def get_profile_summary():
+    summary = [('Этап', 'p50, мс', 'p95, мс', 'max, мс', 'Страниц')]
+    for phase in PHASES:
+        values = [
+            record[phase] * 1000
+            for record in profiler.records.values()
+            if phase in record
+        ]
+        if values:
+            summary.append(
+                (
+                    phase,
+                    f'{percentile(values, 0.5):.1f}',
+                    f'{percentile(values, 0.95):.1f}',
+                    f'{max(values):.1f}',
+                    len(values),
+                )
+            )
+    return summary
+
+
+def get_slowest_urls(count=SLOWEST_URLS_COUNT):
+    totals = {
+        url: sum(record.get(phase, 0) for phase in PHASES)
+        for url, record in profiler.records.items()
+    }
+    slowest = sorted(totals.items(), key=lambda item: item[1], reverse=True)
+    return [
+        ('Ссылка', 'Всего, мс', 'Из кеша', 'Байт'),
+        *(
+            (
+                url,
+                f'{total * 1000:.1f}',
+                profiler.records[url].get('from_cache'),
+                profiler.records[url].get('bytes'),
+            )
+            for url, total in slowest[:count]
+        ),
+    ]
@@ -0,0 +1,156 @@
+import asyncio
+import time
+from http import HTTPStatus
+from threading import Lock
+from urllib.parse import urlsplit
+
+from requests import RequestException
+from requests.adapters import HTTPAdapter
+
+from constants import (
+    RATE_LIMIT_DECREASE_COOLDOWN,
+    RATE_LIMIT_DECREASE_FACTOR,
+    RATE_LIMIT_INCREASE,
+    RATE_LIMIT_INITIAL,
+    RATE_LIMIT_LATENCY_FACTOR,
+    RATE_LIMIT_MAX,
+    RATE_LIMIT_MIN,
+    RATE_LIMIT_SLOW_SAMPLES,
+)
+
+
+THROTTLE_STATUSES = (
+    HTTPStatus.TOO_MANY_REQUESTS,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+)
+LATENCY_SMOOTHING = 0.2
+
+
+class HostLimiter:
+    """Token bucket для одного хоста с AIMD-подстройкой скорости."""
+
+    def __init__(self, rate=RATE_LIMIT_INITIAL):
+        self.rate = rate
+        self.tokens = 1.0
+        self.queue_depth = 0
+        self.latency = None
+        self.slow_samples = 0
+        self.updated_at = time.monotonic()
+        self.decreased_at = 0
+        self._lock = Lock()
+
+    def _refill(self, now):
+        self.tokens = min(
+            max(self.rate, 1.0),
+            self.tokens + (now - self.updated_at) * self.rate,
+        )
+        self.updated_at = now
+
+    def _take(self):
+        # Возвращает 0, если разрешение получено, иначе время ожидания.
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+
+    def _enqueue(self, step):
+        with self._lock:
+            self.queue_depth += step
+
+    def acquire(self):
+        self._enqueue(1)
+        try:
+            delay = self._take()
+            while delay:
+                time.sleep(delay)
+                delay = self._take()
+        finally:
+            self._enqueue(-1)
+
+    async def acquire_async(self):
+        self._enqueue(1)
+        try:
+            delay = self._take()
+            while delay:
+                await asyncio.sleep(delay)
+                delay = self._take()
+        finally:
+            self._enqueue(-1)
+
+    def feedback(self, status_code, latency):
+        with self._lock:
+            now = time.monotonic()
+            # Одиночный медленный ответ (например, полный архив среди
+            # ответов 304) не снижает скорость, только серия таких ответов.
+            if (
+                self.latency is not None
+                and latency > self.latency * RATE_LIMIT_LATENCY_FACTOR
+            ):
+                self.slow_samples += 1
+            else:
+                self.slow_samples = 0
+            slow = self.slow_samples >= RATE_LIMIT_SLOW_SAMPLES
+            if status_code is None or status_code in THROTTLE_STATUSES or slow:
+                if now - self.decreased_at >= RATE_LIMIT_DECREASE_COOLDOWN:
+                    self.rate = max(
+                        RATE_LIMIT_MIN, self.rate * RATE_LIMIT_DECREASE_FACTOR
+                    )
+                    self.decreased_at = now
+                    self.slow_samples = 0
+            else:
+                self.rate = min(
+                    RATE_LIMIT_MAX, self.rate + RATE_LIMIT_INCREASE / self.rate
+                )
+            if status_code is not None:
+                self.latency = (
+                    latency
+                    if self.latency is None
+                    else self.latency
+                    + LATENCY_SMOOTHING * (latency - self.latency)
+                )
+
+
+class RateLimiter:
+    """Набор ограничителей скорости запросов по хостам."""
+
+    def __init__(self):
+        self.hosts = {}
+        self._lock = Lock()
+
+    def for_url(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self.hosts:
+                self.hosts[host] = HostLimiter()
+            return self.hosts[host]
+
+
+rate_limiter = RateLimiter()
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """Адаптер, который соблюдает ограничение скорости запросов к хосту."""
+
+    def send(self, request, **kwargs):
+        limiter = rate_limiter.for_url(request.url)
+        limiter.acquire()
+        started = time.perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+        except RequestException:
+            limiter.feedback(None, time.perf_counter() - started)
+            raise
+        limiter.feedback(response.status_code, time.perf_counter() - started)
+        return response
+
+
+def get_rate_limiter_stats():
+    return [
+        ('Хост', 'Запросов в секунду', 'В очереди'),
+        *(
+            (host, f'{limiter.rate:.1f}', limiter.queue_depth)
+            for host, limiter in rate_limiter.hosts.items()
+        ),
+    ]
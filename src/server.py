@@ -0,0 +1,151 @@
+import json
+import logging
+import time
+from collections import defaultdict, namedtuple
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Event, Lock, Thread
+from urllib.parse import urlsplit
+
+from constants import SERVER_REFRESH_INTERVAL
+
+
+SERVER_STARTED_FORMAT = 'API запущено: http://{host}:{port}/'
+SERVER_STOPPED = 'API остановлено.'
+REFRESH_ERROR_FORMAT = 'Не удалось обновить результаты режима {mode}. {error}'
+NOT_FOUND_ERROR_FORMAT = 'Режим {mode} не найден'
+MODE_ERROR_FORMAT = 'При работе режима {mode} возникла ошибка. {error}'
+
+CachedResult = namedtuple('CachedResult', ('rows', 'updated_at'))
+
+
+class ResultsCache:
+    """Результаты режимов в памяти со сроком жизни и фоновым обновлением.
+
+    Одновременные запросы одного режима ждут единственного вычисления,
+    устаревшие результаты отдаются, пока в фоне вычисляются новые.
+    """
+
+    def __init__(self, compute, ttl):
+        self.compute = compute
+        self.ttl = ttl
+        self.entries = {}
+        self.stopped = Event()
+        self._mode_locks = defaultdict(Lock)
+        self._lock = Lock()
+
+    def _get_lock(self, mode):
+        with self._lock:
+            return self._mode_locks[mode]
+
+    def _expired(self, entry):
+        return time.time() - entry.updated_at >= self.ttl
+
+    def refresh(self, mode, missing_only=False):
+        with self._get_lock(mode):
+            entry = self.entries.get(mode)
+            if entry is not None and (
+                missing_only or not self._expired(entry)
+            ):
+                return entry
+            entry = CachedResult(self.compute(mode), time.time())
+            self.entries[mode] = entry
+            return entry
+
+    def get(self, mode):
+        entry = self.entries.get(mode)
+        if entry is not None:
+            return entry
+        return self.refresh(mode, missing_only=True)
+
+    def refresh_expired(self):
+        for mode, entry in list(self.entries.items()):
+            # Режимы без строк результата не обновляются в фоне.
+            if not entry.rows or not self._expired(entry):
+                continue
+            try:
+                self.refresh(mode)
+            except Exception as error:
+                logging.error(
+                    REFRESH_ERROR_FORMAT.format(mode=mode, error=error)
+                )
+
+    def run_refresher(self, interval=SERVER_REFRESH_INTERVAL):
+        while not self.stopped.wait(interval):
+            self.refresh_expired()
+
+
+def rows_to_json(rows):
+    if not rows:
+        return []
+    header, *rows = rows
+    return [dict(zip(header, row)) for row in rows]
+
+
+class ResultsHandler(BaseHTTPRequestHandler):
+    """JSON-ответы с результатами режимов парсера."""
+
+    results_cache = None
+    modes = ()
+
+    def send_json(self, status, data):
+        body = json.dumps(data, ensure_ascii=False).encode('UTF-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        mode = urlsplit(self.path).path.strip('/')
+        if not mode:
+            return self.send_json(
+                HTTPStatus.OK, [f'/{mode}' for mode in self.modes]
+            )
+        if mode not in self.modes:
+            return self.send_json(
+                HTTPStatus.NOT_FOUND,
+                {'error': NOT_FOUND_ERROR_FORMAT.format(mode=mode)},
+            )
+        try:
+            entry = self.results_cache.get(mode)
+        except Exception as error:
+            message = MODE_ERROR_FORMAT.format(mode=mode, error=error)
+            logging.exception(message)
+            return self.send_json(
+                HTTPStatus.INTERNAL_SERVER_ERROR, {'error': message}
+            )
+        self.send_json(
+            HTTPStatus.OK,
+            {
+                'mode': mode,
+                'updated_at': entry.updated_at,
+                'results': rows_to_json(entry.rows),
+            },
+        )
+
+    def log_message(self, format, *args):
+        logging.info(format, *args)
+
+
+def make_server(compute, modes, host, port, ttl):
+    handler = type(
+        'ResultsHandler',
+        (ResultsHandler,),
+        {'results_cache': ResultsCache(compute, ttl), 'modes': tuple(modes)},
+    )
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def serve(compute, modes, host, port, ttl):
+    server = make_server(compute, modes, host, port, ttl)
+    results_cache = server.RequestHandlerClass.results_cache
+    Thread(target=results_cache.run_refresher, daemon=True).start()
+    logging.info(SERVER_STARTED_FORMAT.format(host=host, port=port))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info(SERVER_STOPPED)
+    finally:
+        results_cache.stopped.set()
+        server.server_close()
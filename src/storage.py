@@ -0,0 +1,98 @@
+import datetime as dt
+import sqlite3
+from contextlib import closing
+
+
+MODE_COLUMNS = {
+    'whats-new': ('link', 'title', 'editors'),
+    'latest-versions': ('link', 'version', 'status'),
+    'pep': ('status', 'count'),
+    'pep-changes': ('number', 'old_status', 'new_status'),
+    'mirror': ('version', 'archive', 'result'),
+}
+CREATE_RUNS = (
+    'CREATE TABLE IF NOT EXISTS runs ('
+    'id INTEGER PRIMARY KEY, mode TEXT NOT NULL, started_at TEXT NOT NULL)'
+)
+CREATE_RUNS_INDEX = (
+    'CREATE INDEX IF NOT EXISTS runs_mode_started_at '
+    'ON runs (mode, started_at)'
+)
+CREATE_MODE_TABLE = (
+    'CREATE TABLE IF NOT EXISTS {table} ('
+    'run_id INTEGER NOT NULL REFERENCES runs (id), {columns})'
+)
+CREATE_MODE_INDEXES = (
+    'CREATE INDEX IF NOT EXISTS {table}_run_id ON {table} (run_id)',
+    'CREATE INDEX IF NOT EXISTS {table}_{key} ON {table} ({key})',
+)
+CREATE_PEP_CARDS = (
+    'CREATE TABLE IF NOT EXISTS pep_cards ('
+    'number TEXT PRIMARY KEY, table_status TEXT, card_status TEXT, '
+    'updated_at TEXT NOT NULL)'
+)
+CREATE_PEP_CARDS_INDEX = (
+    'CREATE INDEX IF NOT EXISTS pep_cards_card_status '
+    'ON pep_cards (card_status)'
+)
+INSERT_RUN = 'INSERT INTO runs (mode, started_at) VALUES (?, ?)'
+INSERT_ROWS = 'INSERT INTO {table} (run_id, {columns}) VALUES (?, {values})'
+UPSERT_PEP_CARDS = (
+    'INSERT INTO pep_cards (number, table_status, card_status, updated_at) '
+    'VALUES (?, ?, ?, ?) ON CONFLICT (number) DO UPDATE SET '
+    'table_status = excluded.table_status, '
+    'card_status = excluded.card_status, '
+    'updated_at = excluded.updated_at'
+)
+
+
+def get_table_name(mode):
+    return mode.replace('-', '_')
+
+
+def create_tables(connection, mode):
+    table = get_table_name(mode)
+    columns = MODE_COLUMNS[mode]
+    connection.execute(CREATE_RUNS)
+    connection.execute(CREATE_RUNS_INDEX)
+    connection.execute(
+        CREATE_MODE_TABLE.format(table=table, columns=', '.join(columns))
+    )
+    for create_index in CREATE_MODE_INDEXES:
+        connection.execute(create_index.format(table=table, key=columns[0]))
+    connection.execute(CREATE_PEP_CARDS)
+    connection.execute(CREATE_PEP_CARDS_INDEX)
+
+
+def pad_rows(rows, width):
+    for row in rows:
+        yield tuple(row[:width]) + (None,) * (width - len(row))
+
+
+def save_results(path, mode, results, pep_cards=None):
+    columns = MODE_COLUMNS[mode]
+    started_at = dt.datetime.now().isoformat(timespec='seconds')
+    rows = iter(results)
+    next(rows, None)
+    with closing(sqlite3.connect(path)) as connection, connection:
+        create_tables(connection, mode)
+        run_id = connection.execute(INSERT_RUN, (mode, started_at)).lastrowid
+        connection.executemany(
+            INSERT_ROWS.format(
+                table=get_table_name(mode),
+                columns=', '.join(columns),
+                values=', '.join('?' * len(columns)),
+            ),
+            ((run_id, *row) for row in pad_rows(rows, len(columns))),
+        )
+        if pep_cards:
+            connection.executemany(
+                UPSERT_PEP_CARDS,
+                (
+                    (number, table_status, card_status, started_at)
+                    for number, (table_status, card_status) in (
+                        pep_cards.items()
+                    )
+                ),
+            )
+    return run_id
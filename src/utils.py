@@ -1,28 +1,107 @@
-from bs4 import BeautifulSoup
-from requests import RequestException
+import base64
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http import HTTPStatus
 
-from exceptions import ParserFindTagException
+from caching import cache_limit, cache_stats, extract_cache
+from constants import (
+    DOWNLOAD_CHUNK_SIZE,
+    DOWNLOAD_SEGMENT_MIN_SIZE,
+    ETAG_SUFFIX,
+    IN_FLIGHT_PER_WORKER,
+    PART_SUFFIX,
+)
+from exceptions import DownloadCheckException, ParserFindTagException
+from fetch_policy import DEADLINE_ERROR, RETRY_STATUSES, fetch_policy
+from profiling import profiler
 
 
 REQUEST_ERROR_FORMAT = 'Возникла ошибка при загрузке страницы {url}. {error}'
 TAG_NOT_FOUND_FORMAT = 'Не найден тег {tag} {attrs}'
+DOWNLOAD_SIZE_ERROR_FORMAT = (
+    'Размер файла {path} ({size} байт) не совпадает с ожидаемым '
+    '({expected} байт)'
+)
+DOWNLOAD_DIGEST_ERROR_FORMAT = (
+    'Контрольная сумма файла {path} не совпадает с ожидаемой'
+)
+RANGE_FORMAT = 'bytes={start}-'
+SEGMENT_RANGE_FORMAT = 'bytes={start}-{end}'
+SEGMENT_STATUS_ERROR_FORMAT = (
+    'Сервер не вернул часть {start}-{end} файла {url}, статус ответа {status}'
+)
+SEGMENT_SIZE_ERROR_FORMAT = (
+    'Часть {start}-{end} файла {url} загружена не полностью: {size} байт'
+)
+DIGEST_HEADERS = ('Repr-Digest', 'Digest')
+DIGEST_ALGORITHM = 'sha-256'
 
 
-def get_response(session, url, encoding='UTF-8'):
-    try:
-        response = session.get(url)
-        response.encoding = encoding
-        return response
-    except RequestException as error:
-        raise ConnectionError(
-            REQUEST_ERROR_FORMAT.format(url=url, error=error)
+def get_response(session, url, encoding='UTF-8', refresh=False):
+    from requests import RequestException
+
+    options = {'force_refresh': True} if refresh else {}
+    for attempt in range(fetch_policy.retries + 1):
+        if fetch_policy.expired():
+            fetch_policy.skip()
+            raise ConnectionError(
+                REQUEST_ERROR_FORMAT.format(url=url, error=DEADLINE_ERROR)
+            )
+        try:
+            with profiler.phase(url, 'fetch'):
+                response = session.get(
+                    url, timeout=fetch_policy.get_timeout(), **options
+                )
+        except RequestException as error:
+            if attempt == fetch_policy.retries:
+                raise ConnectionError(
+                    REQUEST_ERROR_FORMAT.format(url=url, error=error)
+                )
+        else:
+            if (
+                response.status_code not in RETRY_STATUSES
+                or attempt == fetch_policy.retries
+            ):
+                break
+        time.sleep(fetch_policy.get_backoff(attempt))
+    from_cache = getattr(response, 'from_cache', False)
+    cache_stats.record(from_cache)
+    cache_limit.touch(response)
+    if profiler.enabled:
+        profiler.record(
+            url, from_cache=from_cache, bytes=len(response.content)
         )
+    response.encoding = encoding
+    return response
 
 
-def cook_soup(session, url, encoding='UTF-8', features='lxml'):
-    return BeautifulSoup(
-        get_response(session, url, encoding).text, features=features
-    )
+def get_page(session, url, encoding='UTF-8', refresh=False):
+    try:
+        return get_response(session, url, encoding, refresh).text
+    except ConnectionError as error:
+        return error
+
+
+def make_soup(page, features='lxml', parse_only=None):
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    if isinstance(parse_only, dict):
+        parse_only = SoupStrainer(**parse_only)
+    return BeautifulSoup(page, features=features, parse_only=parse_only)
+
+
+def cook_soup(
+    session, url, encoding='UTF-8', features='lxml', parse_only=None
+):
+    page = get_response(session, url, encoding).text
+    with profiler.phase(url, 'parse'):
+        return make_soup(page, features, parse_only)
 
 
 def find_tag(soup, tag, attrs=None):
@@ -32,3 +111,357 @@ def find_tag(soup, tag, attrs=None):
             TAG_NOT_FOUND_FORMAT.format(tag=tag, attrs=attrs)
         )
     return searched_tag
+
+
+def find_xpath(tree, path):
+    found = tree.xpath(path)
+    if not found:
+        raise ParserFindTagException(
+            TAG_NOT_FOUND_FORMAT.format(tag=path, attrs=None)
+        )
+    return found[0]
+
+
+def mount_connection_pool(session, workers):
+    from ratelimit import RateLimitedAdapter
+
+    adapter = RateLimitedAdapter(pool_maxsize=max(workers, 1))
+    for prefix in ('http://', 'https://'):
+        session.mount(prefix, adapter)
+    return session
+
+
+# В отличие от executor.map задачи ставятся в очередь постепенно: не больше
+# IN_FLIGHT_PER_WORKER невыданных результатов на исполнителя.
+def map_bounded(executor, function, iterables, workers):
+    pending = deque()
+    for args in zip(*iterables):
+        if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+            yield pending.popleft().result()
+        pending.append(executor.submit(function, *args))
+    while pending:
+        yield pending.popleft().result()
+
+
+def map_concurrently(function, items, workers=1):
+    if workers <= 1:
+        yield from map(function, items)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from map_bounded(executor, function, (items,), workers)
+
+
+def get_process_context():
+    import multiprocessing
+
+    # fork копирует захваченные потоками блокировки, поэтому процессы
+    # разбора запускаются через forkserver или spawn.
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+def init_process(extract_state, profile):
+    extract_cache.configure(*extract_state)
+    profiler.enabled = profile
+
+
+def call_in_process(function, *args):
+    return function(*args), extract_cache.export(), profiler.export()
+
+
+def map_in_processes(function, *iterables, processes=0):
+    if processes <= 0:
+        yield from map(function, *iterables)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=get_process_context(),
+        initializer=init_process,
+        initargs=(
+            (extract_cache.path, extract_cache.versions),
+            profiler.enabled,
+        ),
+    ) as executor:
+        for result, extracted, records in map_bounded(
+            executor,
+            partial(call_in_process, function),
+            iterables,
+            processes,
+        ):
+            extract_cache.merge(*extracted)
+            profiler.merge(records)
+            yield result
+
+
+def show_progress(iterable, **kwargs):
+    if not sys.stderr.isatty():
+        return iterable
+    from tqdm import tqdm
+
+    return tqdm(iterable, **kwargs)
+
+
+def hash_file(path, chunk_size=DOWNLOAD_CHUNK_SIZE):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest
+
+
+def get_expected_size(response, offset):
+    if 'Content-Encoding' in response.headers:
+        return None
+    content_range = response.headers.get('Content-Range')
+    if content_range is not None:
+        total = content_range.rpartition('/')[2]
+        return int(total) if total.isdigit() else None
+    length = response.headers.get('Content-Length')
+    return offset + int(length) if length is not None else None
+
+
+def get_expected_digest(response):
+    for header in DIGEST_HEADERS:
+        for item in response.headers.get(header, '').split(','):
+            algorithm, _, value = item.strip().partition('=')
+            if algorithm.lower() == DIGEST_ALGORITHM:
+                return base64.b64decode(value.strip(':')).hex()
+    return None
+
+
+def get_response_state(response, offset=0):
+    return {
+        'etag': response.headers.get('ETag'),
+        'size': get_expected_size(response, offset),
+    }
+
+
+# Архивы загружаются в обход кеша. Переключатель session.cache_disabled()
+# действует на всю сессию и небезопасен в потоках, поэтому запросы идут
+# через обычную сессию с теми же адаптерами и заголовками.
+def get_uncached_session(session):
+    from requests import Session
+
+    uncached = Session()
+    uncached.adapters = session.adapters
+    uncached.headers = session.headers
+    return uncached
+
+
+def open_range(session, url, offset, etag=None):
+    headers = {}
+    if offset and etag is not None:
+        headers = {
+            'Range': RANGE_FORMAT.format(start=offset),
+            'If-Range': etag,
+        }
+    response = get_uncached_session(session).get(
+        url,
+        headers=headers,
+        stream=True,
+        timeout=fetch_policy.get_timeout(),
+    )
+    if response.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE:
+        response.close()
+        return open_range(session, url, 0)
+    response.raise_for_status()
+    return response
+
+
+def load_etag(path):
+    if not path.exists():
+        return None
+    return path.read_text(encoding='UTF-8')
+
+
+def save_etag(path, response):
+    etag = response.headers.get('ETag')
+    if etag is None or etag.startswith('W/'):
+        path.unlink(missing_ok=True)
+        return
+    path.write_text(etag, encoding='UTF-8')
+
+
+def get_head(session, url):
+    from requests import RequestException
+
+    try:
+        response = get_uncached_session(session).head(
+            url, allow_redirects=True, timeout=fetch_policy.get_timeout()
+        )
+        response.raise_for_status()
+    except RequestException as error:
+        raise ConnectionError(
+            REQUEST_ERROR_FORMAT.format(url=url, error=error)
+        )
+    return response
+
+
+def get_file_state(session, url):
+    return get_response_state(get_head(session, url))
+
+
+def check_download(path, expected_size, digest, expected_digest):
+    size = path.stat().st_size
+    if expected_size is not None and size != expected_size:
+        path.unlink()
+        raise DownloadCheckException(
+            DOWNLOAD_SIZE_ERROR_FORMAT.format(
+                path=path, size=size, expected=expected_size
+            )
+        )
+    if expected_digest is not None and digest.hexdigest() != expected_digest:
+        path.unlink()
+        raise DownloadCheckException(
+            DOWNLOAD_DIGEST_ERROR_FORMAT.format(path=path)
+        )
+
+
+def get_segments(size, segments):
+    count = max(1, min(segments, size // DOWNLOAD_SEGMENT_MIN_SIZE))
+    bounds = [size * index // count for index in range(count + 1)]
+    return list(zip(bounds, bounds[1:]))
+
+
+def download_segment(session, url, path, etag, segment):
+    start, end = segment
+    headers = {'Range': SEGMENT_RANGE_FORMAT.format(start=start, end=end - 1)}
+    if etag is not None:
+        # Если архив изменился после HEAD, сервер вернёт его целиком
+        # со статусом 200, и такая часть будет отклонена.
+        headers['If-Range'] = etag
+    response = session.get(
+        url,
+        headers=headers,
+        stream=True,
+        timeout=fetch_policy.get_timeout(),
+    )
+    with response, open(path, 'r+b') as file:
+        if response.status_code != HTTPStatus.PARTIAL_CONTENT:
+            raise DownloadCheckException(
+                SEGMENT_STATUS_ERROR_FORMAT.format(
+                    start=start,
+                    end=end,
+                    url=url,
+                    status=response.status_code,
+                )
+            )
+        file.seek(start)
+        for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+            file.write(chunk)
+        size = file.tell() - start
+    if size != end - start:
+        raise DownloadCheckException(
+            SEGMENT_SIZE_ERROR_FORMAT.format(
+                start=start, end=end, url=url, size=size
+            )
+        )
+
+
+def download_segments(session, url, path, head, segments):
+    from requests import RequestException
+
+    size = get_expected_size(head, 0)
+    temp_path = path.with_name(path.name + PART_SUFFIX)
+    with open(temp_path, 'wb') as file:
+        file.truncate(size)
+    parts = get_segments(size, segments)
+    etag = head.headers.get('ETag')
+    if etag is not None and etag.startswith('W/'):
+        etag = None
+    try:
+        list(
+            map_concurrently(
+                partial(
+                    download_segment,
+                    get_uncached_session(session),
+                    url,
+                    temp_path,
+                    etag,
+                ),
+                parts,
+                len(parts),
+            )
+        )
+    except RequestException as error:
+        temp_path.unlink()
+        raise ConnectionError(
+            REQUEST_ERROR_FORMAT.format(url=url, error=error)
+        )
+    except DownloadCheckException:
+        temp_path.unlink()
+        raise
+    digest = hash_file(temp_path)
+    check_download(temp_path, size, digest, get_expected_digest(head))
+    os.replace(temp_path, path)
+    return digest.hexdigest(), get_response_state(head)
+
+
+def download_file(
+    session, url, path, chunk_size=DOWNLOAD_CHUNK_SIZE, segments=1
+):
+    return download_file_state(session, url, path, chunk_size, segments)[0]
+
+
+# Возвращает контрольную сумму и состояние (ETag и размер) загруженного
+# архива по заголовкам ответа, которым он был получен.
+def download_file_state(
+    session, url, path, chunk_size=DOWNLOAD_CHUNK_SIZE, segments=1
+):
+    from requests import RequestException
+
+    if segments > 1:
+        response = get_head(session, url)
+        size = get_expected_size(response, 0)
+        if (
+            response.headers.get('Accept-Ranges') == 'bytes'
+            and size is not None
+            and size >= 2 * DOWNLOAD_SEGMENT_MIN_SIZE
+        ):
+            return download_segments(
+                session, url, path, response, segments
+            )
+    temp_path = path.with_name(path.name + PART_SUFFIX)
+    etag_path = temp_path.with_name(temp_path.name + ETAG_SUFFIX)
+    offset = temp_path.stat().st_size if temp_path.exists() else 0
+    try:
+        response = open_range(session, url, offset, load_etag(etag_path))
+        if response.status_code != HTTPStatus.PARTIAL_CONTENT:
+            offset = 0
+        save_etag(etag_path, response)
+        digest = hash_file(temp_path) if offset else hashlib.sha256()
+        with response, open(temp_path, 'ab' if offset else 'wb') as file:
+            for chunk in response.iter_content(chunk_size):
+                file.write(chunk)
+                digest.update(chunk)
+    except RequestException as error:
+        raise ConnectionError(
+            REQUEST_ERROR_FORMAT.format(url=url, error=error)
+        )
+    check_download(
+        temp_path,
+        get_expected_size(response, offset),
+        digest,
+        get_expected_digest(response),
+    )
+    os.replace(temp_path, path)
+    etag_path.unlink(missing_ok=True)
+    return digest.hexdigest(), get_response_state(response, offset)
+
+
+def load_snapshot(path):
+    if not path.exists():
+        return {}
+    with open(path, encoding='UTF-8') as file:
+        return json.load(file)
+
+
+def save_snapshot(snapshot, path):
+    path.parent.mkdir(exist_ok=True)
+    temp_path = path.with_name(path.name + PART_SUFFIX)
+    with open(temp_path, 'w', encoding='UTF-8') as file:
+        json.dump(snapshot, file, ensure_ascii=False)
+    os.replace(temp_path, path)
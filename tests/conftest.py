@@ -72,6 +72,21 @@ def mock_session(tempfile_session) -> CachedSession:
     yield mount_mock_adapter(tempfile_session)
 
 
+@pytest.fixture
+def cache_settings(monkeypatch):
+    """Fresh LRU limit and async cache settings, restored after the test."""
+    import async_utils
+    import caching
+    import utils
+
+    cache_limit = caching.CacheLimit()
+    async_cache = async_utils.AsyncCache()
+    monkeypatch.setattr(caching, 'cache_limit', cache_limit)
+    monkeypatch.setattr(utils, 'cache_limit', cache_limit)
+    monkeypatch.setattr(async_utils, 'async_cache', async_cache)
+    return cache_limit, async_cache
+
+
 @pytest.fixture
 def response_page(mock_session):
     def _response_page(page):
@@ -0,0 +1,90 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import async_utils
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `async_utils.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `async_utils.py`'
+
+
+def make_page_server(pages):
+    class PageHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = pages[0].encode('UTF-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    http_server = ThreadingHTTPServer(('127.0.0.1', 0), PageHandler)
+    threading.Thread(target=http_server.serve_forever, daemon=True).start()
+    return http_server
+
+
+def test_fetch_texts_uses_rate_limiter(monkeypatch):
+    import ratelimit
+
+    async_cache = async_utils.AsyncCache()
+    async_cache.configure('http_cache_async', 'memory')
+    monkeypatch.setattr(async_utils, 'async_cache', async_cache)
+    rate_limiter = ratelimit.RateLimiter()
+    monkeypatch.setattr(async_utils, 'rate_limiter', rate_limiter)
+    acquired = []
+    acquire_async = ratelimit.HostLimiter.acquire_async
+
+    async def count_acquire(limiter):
+        acquired.append(limiter)
+        await acquire_async(limiter)
+
+    monkeypatch.setattr(ratelimit.HostLimiter, 'acquire_async', count_acquire)
+    http_server = make_page_server(['Active'])
+    host = '127.0.0.1:{}'.format(http_server.server_address[1])
+    urls = [f'http://{host}/pep-{number:04d}/' for number in range(3)]
+    try:
+        list(async_utils.fetch_texts(urls, limit=3))
+        list(async_utils.fetch_texts(urls, limit=3))
+    finally:
+        http_server.shutdown()
+        http_server.server_close()
+    limiter = rate_limiter.hosts[host]
+    assert limiter.latency is not None, (
+        'Запросы асинхронного движка должны проходить через ограничитель '
+        'скорости хоста'
+    )
+    assert acquired == [limiter] * 3, (
+        'Ответы из кеша не должны ждать разрешения ограничителя скорости'
+    )
+
+
+def test_fetch_texts_refresh_updates_cache(monkeypatch):
+    async_cache = async_utils.AsyncCache()
+    async_cache.configure('http_cache_async', 'memory')
+    monkeypatch.setattr(async_utils, 'async_cache', async_cache)
+    pages = ['Active']
+    http_server = make_page_server(pages)
+    url = 'http://127.0.0.1:{}/pep-0001/'.format(
+        http_server.server_address[1]
+    )
+    try:
+        assert list(async_utils.fetch_texts([url])) == ['Active']
+        pages[0] = 'Final'
+        assert list(async_utils.fetch_texts([url])) == ['Active'], (
+            'Без обновления страница должна браться из кеша'
+        )
+        assert list(async_utils.fetch_texts([url], refresh=True)) == [
+            'Final'
+        ]
+        pages[0] = 'Rejected'
+        got = list(async_utils.fetch_texts([url]))
+    finally:
+        http_server.shutdown()
+        http_server.server_close()
+    assert got == ['Final'], (
+        'Обновлённая страница должна сохраняться в кеш асинхронного движка'
+    )
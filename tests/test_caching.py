@@ -0,0 +1,205 @@
+import os
+import sqlite3
+
+from conftest import mount_mock_adapter
+
+try:
+    from src import caching
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `caching.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `caching.py`'
+
+
+def test_cache_stats_hit_ratio():
+    stats = caching.CacheStats()
+    assert stats.hit_ratio == 0, (
+        'Доля попаданий в кеш без запросов должна быть равна нулю'
+    )
+    for from_cache in (True, True, False, True):
+        stats.record(from_cache)
+    assert (stats.hits, stats.misses) == (3, 1), (
+        'Класс `CacheStats` должен считать попадания и промахи кеша'
+    )
+    assert stats.hit_ratio == 0.75, (
+        'Класс `CacheStats` должен считать долю попаданий в кеш'
+    )
+
+
+def test_get_cache_stats(mock_session):
+    mock_session.get('mock://docs.python.org/3/')
+    got = dict(caching.get_cache_stats(mock_session)[1:])
+    assert got['Записей в кеше'] == 1, (
+        'Функция `get_cache_stats` должна показывать количество записей кеша'
+    )
+    assert got['Размер кеша, байт'] == len('You are breathtaken'), (
+        'Функция `get_cache_stats` должна показывать размер кеша'
+    )
+
+
+def test_get_cache_stats_reads_stored_size(tmp_path):
+    from requests_cache import CachedSession
+
+    session = mount_mock_adapter(
+        CachedSession(
+            str(tmp_path / 'http_cache'),
+            serializer=caching.get_compressed_serializer(),
+        )
+    )
+    session.get('mock://docs.python.org/3/')
+    got = dict(caching.get_cache_stats(session)[1:])
+    assert got['Размер кеша, байт'] == (
+        (tmp_path / 'http_cache.sqlite').stat().st_size
+    ), 'Размер кеша SQLite должен браться из размера файла базы'
+
+
+def test_compressed_serializer(tmp_path):
+    from requests_cache import CachedSession
+
+    session = mount_mock_adapter(
+        CachedSession(
+            str(tmp_path / 'http_cache'),
+            serializer=caching.get_compressed_serializer(),
+        )
+    )
+    body = '<p>Python</p>' * 1000
+    session.mock_adapter.register_uri('GET', 'mock://docs/', text=body)
+    session.get('mock://docs/')
+    with session.cache.responses.connection() as connection:
+        (stored,) = connection.execute(
+            'SELECT LENGTH(value) FROM responses'
+        ).fetchone()
+    assert stored < len(body) / 10, (
+        'Ответы должны храниться в кеше в сжатом виде'
+    )
+    assert session.get('mock://docs/').text == body
+
+
+def test_async_serializer():
+    serializer = caching.get_async_serializer()
+    body = {'text': '<p>Python</p>' * 1000}
+    stored = serializer.dumps(body)
+    assert len(stored) < len(body['text']) / 10, (
+        'Ответы асинхронного движка должны храниться в кеше в сжатом виде'
+    )
+    assert serializer.loads(stored) == body
+
+
+def test_is_cacheable():
+    assert caching.is_cacheable(
+        Response(headers={'Content-Type': 'text/html; charset=utf-8'})
+    )
+    assert not caching.is_cacheable(
+        Response(headers={'Content-Type': 'application/zip'})
+    ), 'Архивы не должны сохраняться в кеш страниц'
+    assert not caching.is_cacheable(
+        Response(
+            headers={
+                'Content-Type': 'text/html',
+                'Content-Length': str(100 * 2**20),
+            }
+        )
+    ), 'Слишком большие ответы не должны сохраняться в кеш страниц'
+
+
+def test_cache_limit_evicts_least_recently_used(tmp_path, mock_session):
+    for page in ('first', 'second', 'third'):
+        mock_session.mock_adapter.register_uri(
+            'GET', f'mock://docs/{page}', text=page + os.urandom(500).hex()
+        )
+    cache_limit = caching.CacheLimit()
+    cache_limit.configure(
+        mock_session.cache, max_size=1500, index_path=tmp_path / 'lru.json'
+    )
+    keys = {}
+    for page in ('first', 'second', 'first', 'third'):
+        response = mock_session.get(f'mock://docs/{page}')
+        keys[page] = response.cache_key
+        cache_limit.touch(response)
+    assert set(mock_session.cache.responses) == {
+        keys['first'],
+        keys['third'],
+    }, (
+        'При превышении размера кеша должны вытесняться ответы, '
+        'которые дольше всего не использовались'
+    )
+    assert cache_limit.size <= 1500
+    cache_limit.save()
+    restored = caching.CacheLimit()
+    restored.configure(mock_session.cache, 1500, tmp_path / 'lru.json')
+    assert list(restored.entries) == list(cache_limit.entries), (
+        'Порядок использования ответов должен сохраняться между запусками'
+    )
+
+
+class Response:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+def test_extract_cache_skips_unchanged_pages(tmp_path):
+    extracted = []
+
+    def extract(page):
+        extracted.append(page)
+        return page.upper()
+
+    extract_cache = caching.ExtractCache()
+    extract_cache.configure(
+        tmp_path / 'extracted.sqlite3', {'card': 1, 'article': 1}
+    )
+    for page in ('a', 'a', 'b'):
+        extract_cache.get_or_extract('url', 'card', 'bs4', page, extract)
+    extract_cache.get_or_extract('url', 'article', 'bs4', 'b', extract)
+    assert extracted == ['a', 'b', 'b'], (
+        'Страница должна разбираться заново только при изменении '
+        'её содержимого'
+    )
+    extract_cache.configure(
+        tmp_path / 'extracted.sqlite3', {'card': 2, 'article': 1}
+    )
+    assert (
+        extract_cache.get_or_extract('url', 'card', 'bs4', 'b', extract)
+        == 'B'
+    )
+    assert (
+        extract_cache.get_or_extract('url', 'article', 'bs4', 'b', extract)
+        == 'B'
+    )
+    assert extracted == ['a', 'b', 'b', 'b'], (
+        'Смена версии извлечения должна сбрасывать только его записи'
+    )
+    assert extract_cache.hits == 1
+
+
+def test_extract_cache_separates_parsers(tmp_path):
+    extract_cache = caching.ExtractCache()
+    extract_cache.configure(tmp_path / 'extracted.sqlite3', {'card': 1})
+    extract_cache.get_or_extract('url', 'card', 'bs4', 'a', lambda _: 'bs4')
+    got = extract_cache.get_or_extract(
+        'url', 'card', 'lxml', 'a', lambda _: 'lxml'
+    )
+    assert got == 'lxml', (
+        'Данные, извлечённые одним способом разбора, не должны '
+        'использоваться для другого'
+    )
+
+
+def test_extract_cache_writes_in_batches(monkeypatch, tmp_path):
+    monkeypatch.setattr(caching, 'EXTRACT_CACHE_BATCH', 3)
+    path = tmp_path / 'extracted.sqlite3'
+    extract_cache = caching.ExtractCache()
+    extract_cache.configure(path, {'card': 1})
+    commits = []
+    for page in 'abcd':
+        extract_cache.get_or_extract(page, 'card', 'bs4', page, str.upper)
+        commits.append(extract_cache._connection.total_changes)
+    assert commits == [0, 0, 3, 3], (
+        'Новые записи должны сохраняться в базу пачками'
+    )
+    extract_cache.save()
+    with sqlite3.connect(path) as connection:
+        (count,) = connection.execute(
+            'SELECT COUNT(*) FROM extracted'
+        ).fetchone()
+    assert count == 4
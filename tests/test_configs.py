@@ -39,7 +39,7 @@ def test_configs_file():
             argparse._StoreAction,
             ['-o', '--output'],
             'output',
-            ('pretty', 'file'),
+            ('pretty', 'file', 'sqlite'),
             'Дополнительные способы вывода данных',
         ),
     ],
@@ -70,3 +70,44 @@ def test_configure_argument_parser(
     assert (
         got_action.help == help_str
     ), f'Укажите help-строку cli аргумента {got_action.dest}'
+
+
+def test_configure_session(cache_settings):
+    cli_args = configs.configure_argument_parser(['pep']).parse_args(
+        ['pep', '--cache-backend', 'memory']
+    )
+    session = configs.configure_session(cli_args)
+    assert session.cache.__class__.__name__ == 'BaseCache', (
+        'Функция `configure_session` должна создавать кеш '
+        'в выбранном хранилище'
+    )
+    assert session.settings.urls_expire_after, (
+        'Функция `configure_session` должна задавать срок хранения '
+        'страниц в кеше'
+    )
+    cache_limit, _ = cache_settings
+    assert cache_limit.max_size == 64 * 2**20, (
+        'По умолчанию размер кеша должен ограничиваться 64 МиБ'
+    )
+
+
+def test_configure_session_async_cache(tmp_path, cache_settings):
+    cache_name = str(tmp_path / 'cache')
+    cli_args = configs.configure_argument_parser(['pep']).parse_args(
+        ['pep', '-c', '--engine', 'async', '--cache-name', cache_name]
+    )
+    configs.configure_session(cli_args)
+    _, async_cache = cache_settings
+    assert (async_cache.cache_name, async_cache.backend) == (
+        cache_name + '_async',
+        'sqlite',
+    ), 'Кеш асинхронного движка должен следовать аргументам --cache-*'
+    assert async_cache.clear_pending, (
+        'Аргумент -c должен очищать и кеш асинхронного движка'
+    )
+    async_cache.configure(cache_name + '_async', 'memory')
+    backend = async_cache.get_backend()
+    assert backend is async_cache.get_backend(), (
+        'Кеш асинхронного движка в памяти должен сохраняться '
+        'между загрузками'
+    )
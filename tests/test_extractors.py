@@ -0,0 +1,46 @@
+import pytest
+from bs4 import BeautifulSoup
+
+try:
+    from src import extractors
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `extractors.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `extractors.py`'
+
+PEP_CARD = (
+    '<html><body><h1>PEP 8</h1>'
+    '<dl class="rfc2822 field-list simple">'
+    '<dt class="field-odd">Author<span class="colon">:</span></dt>'
+    '<dd class="field-odd">Guido van Rossum, Barry Warsaw</dd>'
+    '<dt class="field-even">Status<span class="colon">:</span></dt>'
+    '<dd class="field-even"><abbr title="Accepted">Active</abbr></dd>'
+    '<dt class="field-odd">Type<span class="colon">:</span></dt>'
+    '<dd class="field-odd">Process</dd>'
+    '<dt class="field-even">Created<span class="colon">:</span></dt>'
+    '<dd class="field-even">05-Jul-2001</dd>'
+    '<dt class="field-odd">Superseded-By<span class="colon">:</span></dt>'
+    '<dd class="field-odd">9999</dd>'
+    '<dt class="field-even">Unknown<span class="colon">:</span></dt>'
+    '<dd class="field-even">ignored</dd>'
+    '</dl></body></html>'
+)
+
+
+def test_extract_pep_card():
+    got = extractors.extract_pep_card(BeautifulSoup(PEP_CARD, 'lxml'))
+    assert isinstance(got, extractors.PepCard), (
+        'Функция `extract_pep_card` должна возвращать запись `PepCard`'
+    )
+    assert got.status == 'Active'
+    assert got.type == 'Process'
+    assert got.created == '05-Jul-2001'
+    assert got.author == 'Guido van Rossum, Barry Warsaw'
+    assert got.superseded_by == '9999'
+    assert got.requires is None
+
+
+def test_extract_pep_card_without_field_list():
+    with pytest.raises(BaseException) as excinfo:
+        extractors.extract_pep_card(BeautifulSoup('<p></p>', 'lxml'))
+    assert excinfo.typename == 'ParserFindTagException'
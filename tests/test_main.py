@@ -1,8 +1,16 @@
+import subprocess
+import sys
+import threading
+import tracemalloc
+from argparse import Namespace
+from collections import defaultdict
+
 import pytest
+import requests_mock
 from pathlib import Path
 
 try:
-    from src import main
+    from src import configs, main
 except ModuleNotFoundError:
     assert False, 'Убедитесь что в директории `src` есть файл `main.py`'
 except ImportError:
@@ -28,7 +36,7 @@ def test_main_file():
 
 
 def test_whats_new(mock_session):
-    got = main.whats_new(mock_session)
+    got = list(main.whats_new(mock_session))
     header = ('Ссылка на статью', 'Заголовок', 'Редактор, Автор')
     assert isinstance(
         got, list
@@ -125,6 +133,7 @@ def test_mode_to_function():
             'latest-versions',
             'download',
             'pep',
+            'mirror',
         ], (
             'В модуле `main.py` в объекте `MODE_TO_FUNCTION` '
             f'нет ключа `{name_func}`'
@@ -138,7 +147,636 @@ def test_mode_to_function():
             'latest_versions',
             'download',
             'pep',
+            'mirror',
         ], (
             'В модуле `main.py` в объекте `MODE_TO_FUNCTION` '
             f'нет значения {func}'
         )
+
+
+PEP_INDEX = (
+    '<section id="numerical-index"><table><tbody>'
+    '<tr><td>{status_1}</td><td><a href="pep-0001/">1</a></td></tr>'
+    '<tr><td>SF</td><td><a href="pep-0002/">2</a></td></tr>'
+    '</tbody></table></section>'
+)
+PEP_CARD = (
+    '<dl class="rfc2822 field-list simple">'
+    '<dt>Status:</dt><dd>{status}</dd></dl>'
+)
+
+
+def test_pep_incremental(monkeypatch, tmp_path, mock_session):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    mock_session.settings.urls_expire_after = {
+        'peps.python.org/pep-*': -1,
+        'peps.python.org': 0,
+    }
+    with requests_mock.Mocker() as mock:
+        mock.get(main.PEP_TABLE_URL, text=PEP_INDEX.format(status_1='PA'))
+        mock.get(
+            main.PEP_TABLE_URL + 'pep-0001/',
+            text=PEP_CARD.format(status='Active'),
+        )
+        mock.get(
+            main.PEP_TABLE_URL + 'pep-0002/',
+            text=PEP_CARD.format(status='Final'),
+        )
+        main.pep(mock_session)
+        mock.get(main.PEP_TABLE_URL, text=PEP_INDEX.format(status_1='PR'))
+        mock.get(
+            main.PEP_TABLE_URL + 'pep-0001/',
+            text=PEP_CARD.format(status='Rejected'),
+        )
+        mock.reset_mock()
+        got = main.pep(mock_session, incremental=True)
+        requested = [request.url for request in mock.request_history]
+    assert requested == [
+        main.PEP_TABLE_URL,
+        main.PEP_TABLE_URL + 'pep-0001/',
+    ], (
+        'Инкрементальный режим `pep` должен загружать только карточки '
+        'изменившихся PEP'
+    )
+    assert got == [
+        ('Статус', 'Количество'),
+        ('Rejected', 1),
+        ('Final', 1),
+        ('Итого', 2),
+    ], (
+        'Инкрементальный режим `pep` должен собирать таблицу статусов '
+        'из снимка и изменившихся PEP'
+    )
+
+
+def test_pep_incremental_rechecks_mismatched_statuses(
+    monkeypatch, tmp_path, mock_session
+):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    with requests_mock.Mocker() as mock:
+        mock.get(main.PEP_TABLE_URL, text=PEP_INDEX.format(status_1='PR'))
+        mock.get(
+            main.PEP_TABLE_URL + 'pep-0001/',
+            text=PEP_CARD.format(status='Active'),
+        )
+        mock.get(
+            main.PEP_TABLE_URL + 'pep-0002/',
+            text=PEP_CARD.format(status='Final'),
+        )
+        main.pep(mock_session)
+        mock.reset_mock()
+        main.pep(mock_session, incremental=True)
+        requested = [request.url for request in mock.request_history]
+    assert requested == [main.PEP_TABLE_URL + 'pep-0001/'], (
+        'PEP со статусом, не совпадающим с таблицей, должен проверяться '
+        'заново при каждом инкрементальном запуске'
+    )
+
+
+def test_pep_processes_match_serial_run(monkeypatch, tmp_path, mock_session):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    with requests_mock.Mocker() as mock:
+        mock.get(main.PEP_TABLE_URL, text=PEP_INDEX.format(status_1='PA'))
+        mock.get(
+            main.PEP_TABLE_URL + 'pep-0001/',
+            text=PEP_CARD.format(status='Active'),
+        )
+        mock.get(
+            main.PEP_TABLE_URL + 'pep-0002/',
+            text=PEP_CARD.format(status='Final'),
+        )
+        serial = main.pep(mock_session)
+        pipelined = main.pep(mock_session, workers=2, processes=2)
+    assert pipelined == serial, (
+        'Разбор карточек PEP в пуле процессов должен давать тот же '
+        'результат, что и последовательный разбор'
+    )
+
+
+def test_pep_processes_merge_child_state(monkeypatch, tmp_path, mock_session):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    monkeypatch.setattr(main.profiler, 'enabled', True)
+    monkeypatch.setattr(main.profiler, 'records', defaultdict(dict))
+    main.extract_cache.configure(
+        tmp_path / 'extracted.sqlite3', main.EXTRACTOR_VERSIONS
+    )
+    try:
+        with requests_mock.Mocker() as mock:
+            mock.get(main.PEP_TABLE_URL, text=PEP_INDEX.format(status_1='PA'))
+            mock.get(
+                main.PEP_TABLE_URL + 'pep-0001/',
+                text=PEP_CARD.format(status='Active'),
+            )
+            mock.get(
+                main.PEP_TABLE_URL + 'pep-0002/',
+                text=PEP_CARD.format(status='Final'),
+            )
+            main.pep(mock_session, workers=2, processes=2)
+            main.extract_cache.save()
+            main.pep(mock_session, workers=2, processes=2)
+        hits = main.extract_cache.hits
+    finally:
+        main.extract_cache.configure(None, {})
+    assert hits == 2, (
+        'Данные, извлечённые в процессах разбора, должны сохраняться '
+        'в кеш основного процесса'
+    )
+    card_record = main.profiler.records[main.PEP_TABLE_URL + 'pep-0001/']
+    assert 'parse' in card_record, (
+        'Замеры разбора из процессов должны попадать в отчёт `--profile`'
+    )
+
+
+def test_pep_api_source_falls_back_to_cards(
+    monkeypatch, tmp_path, mock_session
+):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    with requests_mock.Mocker() as mock:
+        mock.get(main.PEP_TABLE_URL, text=PEP_INDEX.format(status_1='PA'))
+        mock.get(
+            main.PEP_API_URL,
+            json={'1': {'status': 'Final'}, '2': {'status': 'Final'}},
+        )
+        mock.get(
+            main.PEP_TABLE_URL + 'pep-0001/',
+            text=PEP_CARD.format(status='Active'),
+        )
+        got = main.pep(mock_session, source='api')
+        requested = [request.url for request in mock.request_history]
+    assert requested == [
+        main.PEP_TABLE_URL,
+        main.PEP_API_URL,
+        main.PEP_TABLE_URL + 'pep-0001/',
+    ], (
+        'С источником `api` карточки PEP должны загружаться только для '
+        'записей, которые не совпали с индексом'
+    )
+    assert got == [
+        ('Статус', 'Количество'),
+        ('Active', 1),
+        ('Final', 1),
+        ('Итого', 2),
+    ]
+
+
+@pytest.mark.parametrize(
+    'api_body', [[{'status': 'Final'}], None, {'1': None, '2': 'Final'}]
+)
+def test_pep_api_source_handles_unexpected_json(
+    monkeypatch, tmp_path, mock_session, api_body
+):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    with requests_mock.Mocker() as mock:
+        mock.get(main.PEP_TABLE_URL, text=PEP_INDEX.format(status_1='PA'))
+        mock.get(main.PEP_API_URL, json=api_body)
+        mock.get(
+            main.PEP_TABLE_URL + 'pep-0001/',
+            text=PEP_CARD.format(status='Active'),
+        )
+        mock.get(
+            main.PEP_TABLE_URL + 'pep-0002/',
+            text=PEP_CARD.format(status='Final'),
+        )
+        got = main.pep(mock_session, source='api')
+    assert got[-1] == ('Итого', 2), (
+        'При неожиданном формате JSON-индекса статусы PEP должны браться '
+        'из карточек'
+    )
+
+
+def test_main_import_is_lightweight():
+    heavy_modules = ('bs4', 'requests_cache', 'aiohttp', 'tqdm', 'prettytable')
+    code = (
+        'import sys, main; '
+        f'print(*sorted(set(sys.modules) & set({heavy_modules!r})))'
+    )
+    got = subprocess.run(
+        (sys.executable, '-c', code),
+        cwd=Path(main.__file__).parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert not got.stdout.strip(), (
+        'Импорт модуля `main.py` не должен загружать тяжёлые зависимости: '
+        f'{got.stdout.strip()}'
+    )
+
+
+def test_serve_rejects_deadline(monkeypatch, capsys):
+    monkeypatch.setattr(main, 'configure_logging', lambda: None)
+    monkeypatch.setattr(
+        sys, 'argv', ['main.py', 'serve', '--deadline', '10']
+    )
+    with pytest.raises(SystemExit) as excinfo:
+        main.main()
+    assert excinfo.value.code == 2, (
+        'Аргумент --deadline не должен приниматься в режиме serve'
+    )
+    assert '--deadline' in capsys.readouterr().err
+
+
+def test_async_engine_rejects_cache_size(monkeypatch, capsys):
+    monkeypatch.setattr(main, 'configure_logging', lambda: None)
+    monkeypatch.setattr(
+        sys, 'argv', ['main.py', 'pep', '-e', 'async', '--cache-size', '8']
+    )
+    with pytest.raises(SystemExit) as excinfo:
+        main.main()
+    assert excinfo.value.code == 2, (
+        'Аргумент --cache-size не должен приниматься с --engine async'
+    )
+    assert '--cache-size' in capsys.readouterr().err
+
+
+def test_get_modes_skips_explicit_modes():
+    assert main.get_modes(['all']) == [
+        'whats-new',
+        'latest-versions',
+        'pep',
+    ], (
+        'Режимы `download` и `mirror` не должны запускаться в составе '
+        '`all` и `serve`'
+    )
+    assert main.get_modes(['serve']) == main.get_modes(['all'])
+    assert main.get_modes(['mirror', 'pep']) == ['mirror', 'pep']
+
+
+def test_run_modes_share_session(monkeypatch, mock_session):
+    barrier = threading.Barrier(2, timeout=5)
+    sessions = []
+
+    def first_mode(session):
+        sessions.append(session)
+        barrier.wait()
+        return [('Режим',), ('first',)]
+
+    def second_mode(session, workers):
+        sessions.append(session)
+        barrier.wait()
+        yield ('Режим',)
+        yield ('second', workers)
+
+    monkeypatch.setattr(
+        main,
+        'MODE_TO_FUNCTION',
+        {'first': first_mode, 'second': second_mode},
+    )
+    cli_args = Namespace(mode=main.get_modes(['all']), workers=3)
+    got = [
+        (mode_args.mode, results)
+        for mode_args, results in main.run_modes(mock_session, cli_args)
+    ]
+    assert got == [
+        ('first', [('Режим',), ('first',)]),
+        ('second', [('Режим',), ('second', 3)]),
+    ], (
+        'Несколько режимов должны выполняться одновременно и возвращать '
+        'результаты в порядке их перечисления'
+    )
+    assert sessions == [mock_session, mock_session], (
+        'Режимы, запущенные вместе, должны использовать одну сессию'
+    )
+
+
+def run_watch(monkeypatch, mode, cycles):
+    outputs = []
+
+    def stop_after_last_cycle(delay):
+        if not cycles:
+            raise KeyboardInterrupt
+
+    def run_cycle(session):
+        result = cycles.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result()
+
+    monkeypatch.setattr(main, 'MODE_TO_FUNCTION', {mode: run_cycle})
+    monkeypatch.setattr(
+        main,
+        'control_output',
+        lambda results, args: outputs.append((args.mode, results)),
+    )
+    monkeypatch.setattr(main.time, 'sleep', stop_after_last_cycle)
+    cli_args = configs.configure_argument_parser([mode]).parse_args(
+        [mode, '--watch', '0']
+    )
+    main.watch(None, cli_args)
+    return outputs
+
+
+def test_watch_outputs_only_changed_rows(monkeypatch):
+    header = ('Ссылка на документацию', 'Версия', 'Статус')
+    cycles = [
+        lambda: [header, ('3.12/', '3.12', 'stable'), ('2.7/', '2.7', 'EOL')],
+        lambda: [header, ('3.12/', '3.12', 'stable'), ('2.7/', '2.7', 'EOL')],
+        lambda: [header, ('3.12/', '3.12', 'security-fixes')],
+    ]
+    outputs = run_watch(monkeypatch, 'latest-versions', cycles)
+    assert [results for _, results in outputs] == [
+        [header, ('3.12/', '3.12', 'stable'), ('2.7/', '2.7', 'EOL')],
+        [header, ('3.12/', '3.12', 'security-fixes'), ('2.7/', '', '')],
+    ], (
+        'В режиме наблюдения должны выводиться только строки, '
+        'изменившиеся или пропавшие с прошлой проверки'
+    )
+
+
+def test_watch_tells_apart_archives_of_one_version(monkeypatch):
+    header = ('Версия', 'Архив', 'Результат')
+    cycles = [
+        lambda: [
+            header,
+            ('3.12', 'a.zip', 'Загружен'),
+            ('3.12', 'b.epub', 'Загружен'),
+        ],
+        lambda: [
+            header,
+            ('3.12', 'a.zip', 'Ошибка'),
+            ('3.12', 'b.epub', 'Загружен'),
+        ],
+        lambda: [header, ('3.12', 'a.zip', 'Ошибка')],
+    ]
+    outputs = run_watch(monkeypatch, 'mirror', cycles)
+    assert [results for _, results in outputs] == [
+        [
+            header,
+            ('3.12', 'a.zip', 'Загружен'),
+            ('3.12', 'b.epub', 'Загружен'),
+        ],
+        [header, ('3.12', 'a.zip', 'Ошибка')],
+        [header, ('3.12', 'b.epub', '')],
+    ], (
+        'Строки `mirror` должны сопоставляться по версии и архиву, '
+        'а не только по версии'
+    )
+
+
+def test_watch_outputs_pep_status_changes(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    snapshot_path = tmp_path / main.PEP_SNAPSHOT
+    main.save_snapshot(
+        {'1': ('A', 'Active'), '2': ('F', 'Final')}, snapshot_path
+    )
+
+    def save_cycle(snapshot):
+        def run():
+            main.save_snapshot(snapshot, snapshot_path)
+            return [('Статус', 'Количество'), ('Итого', len(snapshot))]
+
+        return run
+
+    cycles = [
+        save_cycle({'1': ('A', 'Active'), '2': ('F', 'Final')}),
+        save_cycle({'1': ('F', 'Final'), '3': ('D', 'Draft')}),
+    ]
+    outputs = run_watch(monkeypatch, 'pep', cycles)
+    assert outputs == [
+        (
+            'pep-changes',
+            [
+                ('Номер PEP', 'Был статус', 'Стал статус'),
+                ('1', 'Active', 'Final'),
+                ('2', 'Final', ''),
+                ('3', '', 'Draft'),
+            ],
+        )
+    ], (
+        'В режиме наблюдения `pep` должен выводить изменения статусов '
+        'отдельных PEP, включая удалённые'
+    )
+
+
+def test_watch_survives_mode_errors(monkeypatch):
+    header = ('Ссылка на документацию', 'Версия', 'Статус')
+    cycles = [
+        ConnectionError('Индекс недоступен'),
+        lambda: [header, ('3.12/', '3.12', 'stable')],
+    ]
+    outputs = run_watch(monkeypatch, 'latest-versions', cycles)
+    assert outputs == [
+        ('latest-versions', [header, ('3.12/', '3.12', 'stable')])
+    ], 'Ошибка режима не должна останавливать наблюдение'
+
+
+def test_pep_skips_parsing_unchanged_cards(
+    monkeypatch, tmp_path, mock_session
+):
+    parsed = []
+    parse = main.PARSERS['bs4'].parse
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    monkeypatch.setattr(
+        main.PARSERS['bs4'],
+        'parse',
+        lambda page, target=None: parsed.append(page) or parse(page, target),
+    )
+    main.extract_cache.configure(
+        tmp_path / 'extracted.sqlite3', main.EXTRACTOR_VERSIONS
+    )
+    try:
+        with requests_mock.Mocker() as mock:
+            mock.get(main.PEP_TABLE_URL, text=PEP_INDEX.format(status_1='PA'))
+            mock.get(
+                main.PEP_TABLE_URL + 'pep-0001/',
+                text=PEP_CARD.format(status='Active'),
+            )
+            mock.get(
+                main.PEP_TABLE_URL + 'pep-0002/',
+                text=PEP_CARD.format(status='Final'),
+            )
+            cold = main.pep(mock_session)
+            parsed.clear()
+            warm = main.pep(mock_session)
+    finally:
+        main.extract_cache.configure(None, {})
+    assert warm == cold
+    assert len(parsed) == 1, (
+        'При повторном запуске неизменившиеся карточки PEP не должны '
+        'разбираться заново'
+    )
+
+
+PEP_MEMORY_CARDS = 10_000
+PEP_MEMORY_BUDGET = 6 * 2**20
+PEP_MEMORY_CARDS_BS4 = 500
+PEP_MEMORY_BUDGET_BS4 = 2 * 2**20
+PEP_MEMORY_INDEX = (
+    '<section id="numerical-index"><table><tbody>{rows}</tbody></table>'
+    '</section>'
+)
+PEP_MEMORY_INDEX_ROW = (
+    '<tr><td>SF</td><td><a href="pep-{number:05d}/">{number}</a></td></tr>'
+)
+PEP_MEMORY_CARD = '<p>Текст карточки.</p>' * 100 + PEP_CARD.format(
+    status='Final'
+)
+
+
+class SyntheticResponse:
+    status_code = 200
+
+    def __init__(self, text):
+        self.text = text
+
+    @property
+    def content(self):
+        return self.text.encode()
+
+
+class SyntheticPepSession:
+    def __init__(self, cards):
+        self.index = PEP_MEMORY_INDEX.format(
+            rows=''.join(
+                PEP_MEMORY_INDEX_ROW.format(number=number)
+                for number in range(cards)
+            )
+        )
+
+    def get(self, url, **kwargs):
+        if url == main.PEP_TABLE_URL:
+            return SyntheticResponse(self.index)
+        return SyntheticResponse(PEP_MEMORY_CARD)
+
+
+@pytest.mark.parametrize('workers', [1, 8])
+def test_pep_memory_is_bounded(monkeypatch, tmp_path, workers):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    main.extract_cache.configure(
+        tmp_path / 'extracted.sqlite3', main.EXTRACTOR_VERSIONS
+    )
+    session = SyntheticPepSession(PEP_MEMORY_CARDS)
+    tracemalloc.start()
+    try:
+        main.pep(SyntheticPepSession(2), workers=workers, parser='lxml')
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        results = main.pep(session, workers=workers, parser='lxml')
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+        main.extract_cache.configure(None, {})
+    assert results[-1] == ('Итого', PEP_MEMORY_CARDS)
+    assert peak < PEP_MEMORY_BUDGET, (
+        'Пиковое потребление памяти режимом `pep` не должно расти '
+        'с числом карточек PEP: {:.1f} МБ'.format(peak / 2**20)
+    )
+
+
+@pytest.mark.parametrize('workers', [1, 8])
+def test_pep_memory_is_bounded_bs4(monkeypatch, tmp_path, workers):
+    # Дерево индекса BeautifulSoup растёт с числом строк, поэтому пик
+    # измеряется после его разбора, только во время проверки карточек.
+    get_pep_rows = main.get_pep_rows
+    baselines = []
+
+    def get_rows_then_reset(*args, **kwargs):
+        rows = get_pep_rows(*args, **kwargs)
+        tracemalloc.reset_peak()
+        baselines.append(tracemalloc.get_traced_memory()[0])
+        return rows
+
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    monkeypatch.setattr(main, 'get_pep_rows', get_rows_then_reset)
+    main.extract_cache.configure(
+        tmp_path / 'extracted.sqlite3', main.EXTRACTOR_VERSIONS
+    )
+    session = SyntheticPepSession(PEP_MEMORY_CARDS_BS4)
+    tracemalloc.start()
+    try:
+        main.pep(SyntheticPepSession(2), workers=workers)
+        results = main.pep(session, workers=workers)
+        peak = tracemalloc.get_traced_memory()[1] - baselines[-1]
+    finally:
+        tracemalloc.stop()
+        main.extract_cache.configure(None, {})
+    assert results[-1] == ('Итого', PEP_MEMORY_CARDS_BS4)
+    assert peak < PEP_MEMORY_BUDGET_BS4, (
+        'Пиковое потребление памяти при разборе карточек PEP через '
+        'BeautifulSoup не должно расти с их числом: {:.1f} МБ'.format(
+            peak / 2**20
+        )
+    )
+
+
+MIRROR_VERSIONS_PAGE = (
+    '<div class="sphinxsidebarwrapper"><ul>'
+    '<li><a href="https://docs.python.org/3.12/">Python 3.12 (stable)</a>'
+    '</li><li><a href="https://docs.python.org/3.11/">'
+    'Python 3.11 (security-fixes)</a></li>'
+    '<li><a href="https://www.python.org/doc/versions/">All versions</a>'
+    '</li></ul></div>'
+)
+MIRROR_DOWNLOAD_PAGE = (
+    '<table class="docutils"><tr>'
+    '<td><a href="archives/python-{version}-docs-html.zip">HTML</a></td>'
+    '<td><a href="archives/python-{version}-docs.epub">EPUB</a></td>'
+    '</tr></table>'
+)
+
+
+@pytest.mark.parametrize('parser', ['bs4', 'lxml'])
+def test_mirror_skips_unchanged_archives(
+    monkeypatch, tmp_path, mock_session, parser
+):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    with requests_mock.Mocker() as mock:
+        mock.get(main.MAIN_DOC_URL, text=MIRROR_VERSIONS_PAGE)
+        for version in ('3.12', '3.11'):
+            version_url = f'https://docs.python.org/{version}/'
+            mock.get(
+                version_url + 'download.html',
+                text=MIRROR_DOWNLOAD_PAGE.format(version=version),
+            )
+            for name in ('docs-html.zip', 'docs.epub'):
+                url = f'{version_url}archives/python-{version}-{name}'
+                headers = {
+                    'ETag': f'"{version}-{name}"',
+                    'Content-Length': '7',
+                }
+                mock.head(url, headers=headers)
+                mock.get(url, content=b'archive', headers=headers)
+        first = main.mirror(mock_session, workers=4, parser=parser)
+        mock.reset_mock()
+        second = main.mirror(mock_session, workers=4, parser=parser)
+        downloaded = [
+            request.url
+            for request in mock.request_history
+            if request.method == 'GET' and 'archives' in request.url
+        ]
+    assert [row[2] for row in first[1:]] == ['Загружен'] * 4, (
+        'Режим `mirror` должен загружать архивы всех версий и форматов'
+    )
+    assert (tmp_path / 'downloads' / '3.11' / 'python-3.11-docs.epub').exists()
+    assert [row[2] for row in second[1:]] == ['Без изменений'] * 4
+    assert not downloaded, (
+        'Режим `mirror` не должен повторно загружать неизменившиеся архивы'
+    )
+
+
+def test_mirror_records_downloaded_state(monkeypatch, tmp_path, mock_session):
+    def fail():
+        raise AssertionError(
+            'Переключение кеша сессии небезопасно в потоках `mirror`'
+        )
+
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    monkeypatch.setattr(mock_session, 'cache_disabled', fail)
+    url = 'mock://docs.python.org/3.12/archives/python-3.12-docs.epub'
+    mock_session.mock_adapter.register_uri(
+        'HEAD', url, headers={'ETag': '"v1"', 'Content-Length': '7'}
+    )
+    mock_session.mock_adapter.register_uri(
+        'GET',
+        url,
+        content=b'archive!',
+        headers={'ETag': '"v2"', 'Content-Length': '8'},
+    )
+    *_, result, state = main.mirror_archive(
+        mock_session, {}, 1, ('3.12', url)
+    )
+    assert result == 'Загружен'
+    assert state == {'etag': '"v2"', 'size': 8}, (
+        'В манифест `mirror` должно записываться состояние загруженного '
+        'архива, а не ответа на HEAD'
+    )
@@ -1,3 +1,6 @@
+import json
+import sqlite3
+import threading
 from datetime import datetime
 from typing import Optional
 from pathlib import Path
@@ -92,6 +95,70 @@ def test_control_output_file(monkeypatch, tmp_path, records, cli_arg):
     )
 
 
+def test_control_output_default_streams_rows(capsys):
+    def rows():
+        yield ('Статус', 'Количество')
+        captured_out, _ = capsys.readouterr()
+        assert 'Статус Количество' in captured_out, (
+            'Функция `default_output` должна выводить строки по мере '
+            'их поступления'
+        )
+        yield ('Active', 1)
+
+    outputs.control_output(rows(), cli_args('pep', None))
+    captured_out, _ = capsys.readouterr()
+    assert 'Active 1' in captured_out
+
+
+def test_write_rows_flushes_while_mode_is_busy(monkeypatch):
+    monkeypatch.setattr(outputs, 'OUTPUT_FLUSH_INTERVAL', 0.01)
+    flushed = threading.Event()
+
+    class File:
+        def __init__(self):
+            self.written = []
+
+        def flush(self):
+            if self.written:
+                flushed.set()
+
+    file = File()
+
+    def rows():
+        yield ('Статус', 'Количество')
+        assert flushed.wait(5), (
+            'Записанные строки должны сбрасываться в файл по таймеру, '
+            'пока режим готовит следующую строку'
+        )
+        yield ('Final', 1)
+
+    outputs.write_rows(rows(), file.written.append, file)
+    assert file.written == [('Статус', 'Количество'), ('Final', 1)]
+
+
+def test_control_output_sqlite(monkeypatch, tmp_path, records):
+    monkeypatch.setattr(outputs, 'BASE_DIR', tmp_path)
+    (tmp_path / 'snapshots').mkdir()
+    (tmp_path / 'snapshots' / 'pep.json').write_text(
+        json.dumps({'1': ['A', 'Active'], '2': ['F', 'Final']})
+    )
+    cli_arg = cli_args('pep', 'sqlite')
+    for _ in range(2):
+        outputs.control_output(records(cli_arg.mode), cli_arg)
+    with sqlite3.connect(tmp_path / 'results' / 'results.sqlite3') as db:
+        runs = db.execute('SELECT COUNT(*) FROM runs').fetchone()[0]
+        rows = db.execute('SELECT COUNT(*) FROM pep').fetchone()[0]
+        cards = db.execute('SELECT COUNT(*) FROM pep_cards').fetchone()[0]
+    assert runs == 2, 'Каждый запуск должен сохраняться в таблицу `runs`'
+    assert rows == 2 * (len(records(cli_arg.mode)) - 1), (
+        'Строки результатов каждого запуска должны сохраняться в таблицу '
+        'режима'
+    )
+    assert cards == 2, (
+        'Повторный запуск не должен дублировать строки таблицы `pep_cards`'
+    )
+
+
 def test_output_file():
     assert hasattr(
         outputs, 'control_output'
@@ -0,0 +1,125 @@
+import pytest
+import requests_mock
+
+try:
+    from src import main
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `main.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `main.py`'
+
+WHATS_NEW_INDEX = '''<html><body>
+<section id="what-s-new-in-python"><h1>What’s New in Python</h1>
+<div class="toctree-wrapper compound"><ul>
+<li class="toctree-l1"><a class="reference internal" href="3.12.html">
+What’s New In Python 3.12</a>
+<ul><li class="toctree-l2"><a href="3.12.html#summary">Summary</a></li></ul>
+</li>
+<li class="toctree-l1"><a class="reference internal" href="3.11.html">
+What’s New In Python 3.11</a></li>
+</ul></div></section></body></html>'''
+WHATS_NEW_PAGE = '''<html><body><section id="what-s-new-in-python-{version}">
+<h1>What’s New In Python {version}<a class="headerlink" href="#">¶</a></h1>
+<dl class="field-list simple">
+<dt class="field-odd">Editor<span class="colon">:</span></dt>
+<dd class="field-odd"><p>Editor of {version}</p>
+</dd>
+</dl><p>Text</p></section></body></html>'''
+MAIN_DOC_PAGE = '''<html><body><div class="sphinxsidebar">
+<div class="sphinxsidebarwrapper"><h3>Docs by version</h3><ul>
+<li><a href="https://docs.python.org/3.13/">Python 3.13 (in development)</a></li>
+<li><a href="https://docs.python.org/3.12/">Python 3.12 (stable)</a></li>
+<li><a href="https://www.python.org/doc/versions/">All versions</a></li>
+</ul><h3>Other resources</h3><ul><li><a href="/faq">FAQ</a></li></ul>
+</div></div></body></html>'''
+DOWNLOADS_PAGE = '''<html><body><table class="docutils align-default">
+<tr><td>PDF (A4 paper size)</td>
+<td><a class="reference external" href="archives/python-docs-pdf-a4.zip">
+Download</a> (ca. 17 MiB)</td></tr>
+<tr><td>PDF (US-Letter)</td>
+<td><a href="archives/python-docs-pdf-letter.zip">Download</a></td></tr>
+</table></body></html>'''
+PEP_INDEX = '''<html><body><section id="numerical-index">
+<h2>Numerical Index</h2><table class="pep-zero-table docutils">
+<thead><tr><th>Status</th><th>PEP</th></tr></thead><tbody>
+<tr class="row-even"><td><abbr title="Process, Active">PA</abbr></td>
+<td><a class="pep reference internal" href="../pep-0001/">1</a></td>
+<td><a href="../pep-0001/">PEP Purpose and Guidelines</a></td></tr>
+<tr class="row-odd"><td><abbr title="Standards Track, Final">SF</abbr></td>
+<td><a class="pep reference internal" href="../pep-0008/">8</a></td>
+<td><a href="../pep-0008/">Style Guide for Python Code</a></td></tr>
+</tbody></table></section></body></html>'''
+PEP_CARD = '''<html><body><article><h1>PEP {number}</h1>
+<dl class="rfc2822 field-list simple">
+<dt class="field-odd">Author<span class="colon">:</span></dt>
+<dd class="field-odd">Guido van Rossum &lt;guido at python.org&gt;</dd>
+<dt class="field-even">Status<span class="colon">:</span></dt>
+<dd class="field-even"><abbr title="Accepted">{status}</abbr></dd>
+<dt class="field-odd">Type<span class="colon">:</span></dt>
+<dd class="field-odd"><abbr title="Normative">Process</abbr></dd>
+</dl><section><dl><dt>Other</dt><dd>list</dd></dl></section>
+</article></body></html>'''
+
+
+@pytest.fixture
+def python_docs():
+    with requests_mock.Mocker() as mock:
+        mock.get(main.WHATS_NEW_URL, text=WHATS_NEW_INDEX)
+        for version in ('3.12', '3.11'):
+            mock.get(
+                f'{main.WHATS_NEW_URL}{version}.html',
+                text=WHATS_NEW_PAGE.format(version=version),
+            )
+        mock.get(main.MAIN_DOC_URL, text=MAIN_DOC_PAGE)
+        mock.get(main.DOWNLOADS_URL, text=DOWNLOADS_PAGE)
+        mock.get(
+            main.MAIN_DOC_URL + 'archives/python-docs-pdf-a4.zip',
+            content=b'archive',
+        )
+        mock.get(main.PEP_TABLE_URL, text=PEP_INDEX)
+        for number, status in (('0001', 'Active'), ('0008', 'Final')):
+            mock.get(
+                f'https://peps.python.org/pep-{number}/',
+                text=PEP_CARD.format(number=number, status=status),
+            )
+        yield mock
+
+
+@pytest.mark.parametrize('mode', ['whats-new', 'latest-versions', 'pep'])
+def test_parsers_produce_same_rows(
+    monkeypatch, tmp_path, mock_session, python_docs, mode
+):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    function = main.MODE_TO_FUNCTION[mode]
+    got = {
+        parser: list(function(mock_session, parser=parser))
+        for parser in ('bs4', 'lxml')
+    }
+    assert len(got['bs4']) > 1, f'Режим {mode} не нашёл данных на странице'
+    assert got['lxml'] == got['bs4'], (
+        f'Режим {mode} должен возвращать одинаковые строки '
+        'для разных способов разбора HTML'
+    )
+
+
+def test_parsers_download_same_archive(
+    monkeypatch, tmp_path, mock_session, python_docs
+):
+    for parser in ('bs4', 'lxml'):
+        monkeypatch.setattr(main, 'BASE_DIR', tmp_path / parser)
+        (tmp_path / parser).mkdir()
+        main.download(mock_session, parser=parser)
+    assert [
+        file.name for file in (tmp_path / 'lxml' / 'downloads').iterdir()
+    ] == [file.name for file in (tmp_path / 'bs4' / 'downloads').iterdir()]
+
+
+@pytest.mark.parametrize('parser', ['bs4', 'lxml'])
+def test_parsers_raise_on_missing_tag(parser):
+    html_parser = main.PARSERS[parser]
+    with pytest.raises(BaseException) as excinfo:
+        html_parser.pep_card(html_parser.parse('<html><p>PEP</p></html>'))
+    assert excinfo.typename == 'ParserFindTagException', (
+        'Оба способа разбора HTML должны выбрасывать '
+        '`ParserFindTagException`, если тег не найден'
+    )
@@ -0,0 +1,34 @@
+try:
+    from src import profiling
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `profiling.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `profiling.py`'
+
+
+def test_phase_is_noop_when_disabled():
+    profiler = profiling.Profiler()
+    with profiler.phase('https://peps.python.org/', 'fetch'):
+        pass
+    assert not profiler.records, (
+        'Выключенный профилировщик не должен сохранять замеры'
+    )
+
+
+def test_profile_summary(monkeypatch):
+    profiler = profiling.Profiler()
+    profiler.enabled = True
+    monkeypatch.setattr(profiling, 'profiler', profiler)
+    for number in range(1, 21):
+        url = f'https://peps.python.org/pep-{number:04d}/'
+        profiler.add(url, 'fetch', number / 1000)
+        profiler.record(url, from_cache=False, bytes=number)
+    summary = profiling.get_profile_summary()
+    assert summary[1] == ('fetch', '10.0', '19.0', '20.0', 20), (
+        'Сводка профилировщика должна содержать p50/p95/max для этапа'
+    )
+    slowest = profiling.get_slowest_urls(count=2)
+    assert [row[0] for row in slowest[1:]] == [
+        'https://peps.python.org/pep-0020/',
+        'https://peps.python.org/pep-0019/',
+    ], 'Сводка профилировщика должна показывать самые медленные страницы'
@@ -0,0 +1,62 @@
+try:
+    from src import ratelimit
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `ratelimit.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `ratelimit.py`'
+
+
+def test_host_limiter_adapts_rate():
+    limiter = ratelimit.HostLimiter(rate=10)
+    for _ in range(5):
+        limiter.feedback(200, 0.1)
+    assert limiter.rate > 10, (
+        'Скорость запросов должна расти, пока хост отвечает без ошибок'
+    )
+    healthy_rate = limiter.rate
+    limiter.feedback(429, 0.1)
+    assert limiter.rate == healthy_rate / 2, (
+        'Скорость запросов должна снижаться при ответе 429'
+    )
+    limiter.decreased_at = 0
+    limiter.feedback(200, 1)
+    assert limiter.rate > healthy_rate / 2, (
+        'Один медленный ответ не должен снижать скорость запросов'
+    )
+    slowed_rate = limiter.rate
+    limiter.feedback(200, 1)
+    limiter.feedback(200, 1)
+    assert limiter.rate < slowed_rate, (
+        'Скорость запросов должна снижаться при росте задержки ответов'
+    )
+
+
+def test_host_limiter_acquire_async():
+    import asyncio
+
+    limiter = ratelimit.HostLimiter(rate=100)
+    for _ in range(3):
+        asyncio.run(limiter.acquire_async())
+    assert limiter.queue_depth == 0
+    assert limiter.tokens < 1, (
+        'Асинхронные запросы должны расходовать разрешения ограничителя'
+    )
+
+
+def test_host_limiter_acquire():
+    limiter = ratelimit.HostLimiter(rate=100)
+    for _ in range(3):
+        limiter.acquire()
+    assert limiter.queue_depth == 0, (
+        'После получения разрешения запрос должен покидать очередь'
+    )
+
+
+def test_rate_limiter_is_per_host():
+    limiter = ratelimit.RateLimiter()
+    assert limiter.for_url('https://peps.python.org/pep-0008/') is (
+        limiter.for_url('https://peps.python.org/')
+    )
+    assert limiter.for_url('https://peps.python.org/') is not (
+        limiter.for_url('https://docs.python.org/3/')
+    ), 'Скорость запросов должна ограничиваться для каждого хоста отдельно'
@@ -0,0 +1,116 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+try:
+    from src import server
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `server.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `server.py`'
+
+
+def test_results_cache_coalesces_requests():
+    calls = []
+
+    def compute(mode):
+        calls.append(mode)
+        time.sleep(0.1)
+        return [('Статус', 'Количество'), ('Final', len(calls))]
+
+    results_cache = server.ResultsCache(compute, ttl=60)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        entries = list(executor.map(results_cache.get, ['pep'] * 8))
+    assert calls == ['pep'], (
+        'Одновременные запросы одного режима должны вычисляться один раз'
+    )
+    assert all(entry is entries[0] for entry in entries)
+
+
+def test_results_cache_refreshes_expired_entries():
+    calls = []
+
+    def compute(mode):
+        calls.append(mode)
+        return [('Статус', 'Количество'), ('Final', len(calls))]
+
+    results_cache = server.ResultsCache(compute, ttl=60)
+    first = results_cache.get('pep')
+    results_cache.refresh_expired()
+    assert results_cache.get('pep') is first, (
+        'Результаты не должны пересчитываться до истечения срока хранения'
+    )
+    results_cache.entries['pep'] = first._replace(updated_at=0)
+    results_cache.refresh_expired()
+    assert results_cache.get('pep').rows[1] == ('Final', 2), (
+        'Устаревшие результаты должны обновляться в фоне'
+    )
+
+
+def test_server_returns_json_results():
+    http_server = server.make_server(
+        lambda mode: [('Статус', 'Количество'), ('Final', 3)],
+        ['pep', 'latest-versions'],
+        '127.0.0.1',
+        0,
+        60,
+    )
+    threading.Thread(target=http_server.serve_forever, daemon=True).start()
+    url = 'http://127.0.0.1:{}/'.format(http_server.server_address[1])
+    try:
+        with urlopen(url + 'pep') as response:
+            got = json.loads(response.read())
+        with urlopen(url) as response:
+            endpoints = json.loads(response.read())
+    finally:
+        http_server.shutdown()
+        http_server.server_close()
+    assert got['mode'] == 'pep'
+    assert got['results'] == [{'Статус': 'Final', 'Количество': 3}], (
+        'API должно возвращать строки результатов в виде JSON-объектов'
+    )
+    assert endpoints == ['/pep', '/latest-versions']
+
+
+def test_server_skips_modes_without_rows():
+    from src import main
+
+    computed = []
+    http_server = server.make_server(
+        computed.append, main.get_modes(['serve']), '127.0.0.1', 0, 60
+    )
+    threading.Thread(target=http_server.serve_forever, daemon=True).start()
+    url = 'http://127.0.0.1:{}/'.format(http_server.server_address[1])
+    try:
+        with urlopen(url) as response:
+            endpoints = json.loads(response.read())
+        with pytest.raises(HTTPError) as excinfo:
+            urlopen(url + 'download')
+    finally:
+        http_server.shutdown()
+        http_server.server_close()
+    assert '/download' not in endpoints and '/mirror' not in endpoints
+    assert excinfo.value.code == 404 and not computed, (
+        'Режим `download` не должен запускаться сервером'
+    )
+
+
+def test_results_cache_skips_modes_without_rows():
+    calls = []
+
+    def compute(mode):
+        calls.append(mode)
+        return None
+
+    results_cache = server.ResultsCache(compute, ttl=60)
+    entry = results_cache.get('download')
+    results_cache.entries['download'] = entry._replace(updated_at=0)
+    results_cache.refresh_expired()
+    assert calls == ['download'], (
+        'Режимы без строк результата не должны перезапускаться в фоне'
+    )
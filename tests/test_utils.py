@@ -1,3 +1,4 @@
+import hashlib
 import pytest
 import requests
 import requests_mock
@@ -52,3 +53,210 @@ def test_get_response(mock_session):
             'делает запрос к странице и возвращает ответ. \n'
             'Кстати: You are breathtaken!'
         )
+
+
+def test_get_response_retries_transient_errors(monkeypatch, mock_session):
+    monkeypatch.setattr(utils.fetch_policy, 'get_backoff', lambda attempt: 0)
+    url = 'mock://docs.python.org/retry/'
+    mock_session.mock_adapter.register_uri(
+        'GET',
+        url,
+        [{'status_code': 503}, {'status_code': 200, 'text': 'Готово'}],
+    )
+    got = utils.get_response(mock_session, url)
+    assert got.text == 'Готово', (
+        'Функция `get_response` должна повторять запрос после ответа 503'
+    )
+
+
+def test_get_response_stops_after_deadline(monkeypatch, mock_session):
+    monkeypatch.setattr(utils.fetch_policy, 'deadline', 0)
+    monkeypatch.setattr(utils.fetch_policy, 'skipped', 0)
+    with pytest.raises(ConnectionError):
+        utils.get_response(mock_session, 'mock://docs.python.org/')
+    assert utils.fetch_policy.skipped == 1, (
+        'Функция `get_response` должна считать страницы, пропущенные '
+        'из-за лимита времени работы'
+    )
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_map_concurrently_keeps_order(workers):
+    got = list(utils.map_concurrently(lambda x: x * 2, range(20), workers))
+    assert got == [x * 2 for x in range(20)], (
+        'Функция `map_concurrently` в модуле `utils.py` должна возвращать '
+        'результаты в порядке исходных элементов'
+    )
+
+
+def test_map_concurrently_limits_in_flight():
+    pulled = []
+
+    def items():
+        for item in range(100):
+            pulled.append(item)
+            yield item
+
+    results = utils.map_concurrently(lambda x: x, items(), workers=4)
+    assert next(results) == 0
+    results.close()
+    assert len(pulled) <= 4 * utils.IN_FLIGHT_PER_WORKER + 1, (
+        'Функция `map_concurrently` в модуле `utils.py` не должна ставить '
+        'в очередь все элементы сразу'
+    )
+
+
+@pytest.mark.parametrize('processes', [0, 2])
+def test_map_in_processes_keeps_order(processes):
+    got = list(
+        utils.map_in_processes(pow, range(20), range(20), processes=processes)
+    )
+    assert got == [x**x for x in range(20)], (
+        'Функция `map_in_processes` в модуле `utils.py` должна возвращать '
+        'результаты в порядке исходных элементов'
+    )
+
+
+def test_download_file_resumes_partial_download(mock_session, tmp_path):
+    archive = bytes(range(256)) * 1024
+    requested_ranges = []
+
+    def archive_content(request, context):
+        requested_ranges.append(request.headers.get('Range'))
+        assert request.headers.get('If-Range') == '"v1"', (
+            'Продолжение загрузки должно проверять ETag заголовком If-Range'
+        )
+        start = int(request.headers['Range'][6:-1])
+        context.status_code = 206
+        context.headers['ETag'] = '"v1"'
+        context.headers['Content-Range'] = (
+            f'bytes {start}-{len(archive) - 1}/{len(archive)}'
+        )
+        return archive[start:]
+
+    mock_session.mock_adapter.register_uri(
+        'GET', 'mock://docs.python.org/archive.zip', content=archive_content
+    )
+    path = tmp_path / 'archive.zip'
+    (tmp_path / 'archive.zip.part').write_bytes(archive[:1000])
+    (tmp_path / 'archive.zip.part.etag').write_text('"v1"')
+    digest = utils.download_file(
+        mock_session, 'mock://docs.python.org/archive.zip', path
+    )
+    assert requested_ranges == ['bytes=1000-'], (
+        'Функция `download_file` должна продолжать прерванную загрузку '
+        'с помощью заголовка Range'
+    )
+    assert path.read_bytes() == archive
+    assert not (tmp_path / 'archive.zip.part').exists()
+    assert not (tmp_path / 'archive.zip.part.etag').exists()
+    assert digest == hashlib.sha256(archive).hexdigest()
+
+
+def test_download_file_restarts_changed_archive(mock_session, tmp_path):
+    archive = bytes(range(256)) * 1024
+    url = 'mock://docs.python.org/archive.zip'
+    mock_session.mock_adapter.register_uri(
+        'GET', url, content=archive, headers={'ETag': '"v2"'}
+    )
+    path = tmp_path / 'archive.zip'
+    (tmp_path / 'archive.zip.part').write_bytes(b'x' * 1000)
+    (tmp_path / 'archive.zip.part.etag').write_text('"v1"')
+    utils.download_file(mock_session, url, path)
+    request = mock_session.mock_adapter.last_request
+    assert request.headers.get('If-Range') == '"v1"'
+    assert path.read_bytes() == archive, (
+        'Если архив на сервере изменился, загрузка должна начинаться '
+        'заново, а не дописываться к старой части'
+    )
+
+
+def test_download_file_in_segments(monkeypatch, mock_session, tmp_path):
+    monkeypatch.setattr(utils, 'DOWNLOAD_SEGMENT_MIN_SIZE', 1024)
+    archive = bytes(range(256)) * 40
+    requested_ranges = []
+
+    def archive_content(request, context):
+        requested_ranges.append(request.headers['Range'])
+        assert request.headers.get('If-Range') == '"v1"', (
+            'Части архива должны запрашиваться с ETag из ответа на HEAD'
+        )
+        start, end = map(int, request.headers['Range'][6:].split('-'))
+        context.status_code = 206
+        context.headers['Content-Range'] = (
+            f'bytes {start}-{end}/{len(archive)}'
+        )
+        return archive[start:end + 1]
+
+    url = 'mock://docs.python.org/archive.zip'
+    mock_session.mock_adapter.register_uri(
+        'HEAD',
+        url,
+        headers={
+            'Accept-Ranges': 'bytes',
+            'Content-Length': str(len(archive)),
+            'ETag': '"v1"',
+        },
+    )
+    mock_session.mock_adapter.register_uri('GET', url, content=archive_content)
+    path = tmp_path / 'archive.zip'
+    monkeypatch.setattr(mock_session, 'cache_disabled', None)
+    digest = utils.download_file(mock_session, url, path, segments=4)
+    assert sorted(requested_ranges) == [
+        'bytes=0-2559',
+        'bytes=2560-5119',
+        'bytes=5120-7679',
+        'bytes=7680-10239',
+    ], 'Функция `download_file` должна загружать архив по частям'
+    assert path.read_bytes() == archive, (
+        'Части архива должны собираться в исходный файл'
+    )
+    assert digest == hashlib.sha256(archive).hexdigest()
+
+
+def test_download_file_without_ranges(monkeypatch, mock_session, tmp_path):
+    monkeypatch.setattr(utils, 'DOWNLOAD_SEGMENT_MIN_SIZE', 1024)
+    archive = bytes(range(256)) * 40
+    url = 'mock://docs.python.org/archive.zip'
+    mock_session.mock_adapter.register_uri(
+        'HEAD', url, headers={'Content-Length': str(len(archive))}
+    )
+    mock_session.mock_adapter.register_uri('GET', url, content=archive)
+    path = tmp_path / 'archive.zip'
+    utils.download_file(mock_session, url, path, segments=4)
+    requests_made = [
+        (request.method, request.headers.get('Range'))
+        for request in mock_session.mock_adapter.request_history
+    ]
+    assert requests_made == [('HEAD', None), ('GET', None)], (
+        'Без заголовка Accept-Ranges архив должен загружаться одним потоком'
+    )
+    assert path.read_bytes() == archive
+
+
+def test_download_file_rejects_changed_segments(
+    monkeypatch, mock_session, tmp_path
+):
+    monkeypatch.setattr(utils, 'DOWNLOAD_SEGMENT_MIN_SIZE', 1024)
+    archive = bytes(range(256)) * 40
+    url = 'mock://docs.python.org/archive.zip'
+    mock_session.mock_adapter.register_uri(
+        'HEAD',
+        url,
+        headers={
+            'Accept-Ranges': 'bytes',
+            'Content-Length': str(len(archive)),
+            'ETag': '"v1"',
+        },
+    )
+    mock_session.mock_adapter.register_uri(
+        'GET', url, content=archive, headers={'ETag': '"v2"'}
+    )
+    path = tmp_path / 'archive.zip'
+    with pytest.raises(utils.DownloadCheckException):
+        utils.download_file(mock_session, url, path, segments=4)
+    assert not path.exists(), (
+        'Части изменившегося архива, полученные целиком, '
+        'должны отклоняться'
+    )
+    assert not (tmp_path / 'archive.zip.part').exists()